@@ -12,16 +12,149 @@ Usage:
 """
 
 import argparse
-import json
+import asyncio
+import hashlib
+import aiohttp
+import orjson
 import requests
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Any, List, Optional
 
 
 API_BASE_URL = "http://localhost:8000"
 
+# Events per POST /ingest/batch request (the endpoint accepts up to 100). On the
+# per-episode path the server ingests a tenant's items one after another before it
+# replies, each with several LLM calls, so a batch has to finish within the read
+# timeout in REQUEST_TIMEOUT
+BATCH_SIZE = 5
 
-def ingest_event(
+# Length of the timeline covered by one pass over EVENTS
+CYCLE_DAYS = 30
+
+# Sample event templates; `days` is the offset from the start of each cycle
+EVENTS = [
+    # Example 1: Employee onboarding
+    {
+        "data": "Sarah Johnson joined TechCorp as Senior Software Engineer in the Engineering department",
+        "days": 0,
+        "context": "Employee onboarding event",
+        "customer_id": None,
+        "customer_name": None,
+    },
+    # Example 2: Project assignment with customer context
+    {
+        "data": "Sarah Johnson was assigned to lead the Cloud Migration project for Acme Corp",
+        "days": 5,
+        "context": "Project assignment",
+        "customer_id": "CUST001",
+        "customer_name": "Acme Corp",
+    },
+    # Example 3: Meeting event
+    {
+        "data": "Sarah Johnson and Michael Chen had a planning meeting to discuss the Cloud Migration architecture",
+        "days": 7,
+        "context": "Team collaboration meeting",
+        "customer_id": None,
+        "customer_name": None,
+    },
+    # Example 4: Customer interaction
+    {
+        "data": "Michael Chen presented the Cloud Migration proposal to Acme Corp stakeholders",
+        "days": 10,
+        "context": "Customer presentation",
+        "customer_id": "CUST001",
+        "customer_name": "Acme Corp",
+    },
+    # Example 5: Project milestone
+    {
+        "data": "The Cloud Migration project completed Phase 1 successfully with all deliverables met",
+        "days": 20,
+        "context": "Project milestone achievement",
+        "customer_id": None,
+        "customer_name": None,
+    },
+    # Example 6: Employee promotion
+    {
+        "data": "Sarah Johnson was promoted to Engineering Manager due to excellent performance on the Cloud Migration project",
+        "days": 25,
+        "context": "Employee promotion event",
+        "customer_id": None,
+        "customer_name": None,
+    },
+]
+
+# (connect, read) timeouts in seconds - reads allow for server-side LLM extraction
+REQUEST_TIMEOUT = (3.05, 90)
+
+# Request bodies are pre-encoded with orjson, so the content type is set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@dataclass
+class APIError(Exception):
+    """Error response (HTTP status >= 400) returned by the API."""
+    status_code: int
+    body: bytes
+
+    def __str__(self) -> str:
+        return f"API returned HTTP {self.status_code}: {self.body.decode(errors='replace')}"
+
+
+def _create_session() -> requests.Session:
+    """Create a shared HTTP session with keep-alive connection pooling and retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        # Only idempotent methods are retried after a read error or 5xx; POSTs are
+        # retried only when the connection failed, i.e. the request was never sent.
+        # The server stores an Idempotency-Key response only once an ingest has
+        # succeeded, so replaying a timed-out ingest would run extraction again.
+        max_retries=Retry(
+            total=3,
+            connect=3,
+            read=3,
+            backoff_factor=0.25,
+            status_forcelist=(502, 503, 504)
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Advertise every content encoding urllib3 can decode (adds br when brotli is installed)
+    session.headers.update(make_headers(accept_encoding=True))
+    return session
+
+
+# Reused across all calls so the underlying TCP connections are kept alive
+_SESSION = _create_session()
+
+
+def warm_search_cache(tenant_id: str) -> None:
+    """Ask the server to re-run its warm-up queries for a tenant (best effort)."""
+    try:
+        response = _SESSION.post(
+            f"{API_BASE_URL}/admin/cache/warm",
+            params={"tenant_id": tenant_id},
+            timeout=REQUEST_TIMEOUT
+        )
+        if response.status_code >= 400:
+            raise APIError(response.status_code, response.content[:512])
+        print(f"🔥 Warmed search cache: {orjson.loads(response.content)['queries_warmed']} queries")
+    except (APIError, requests.exceptions.RequestException) as e:
+        print(f"⚠️  Could not warm search cache: {e}")
+
+
+def idempotency_key(tenant_id: str, data: Any, reference_time: Optional[str] = None) -> str:
+    """Content hash identifying an event, so re-submitting it is not re-extracted by the server."""
+    return hashlib.sha256(f"{tenant_id}|{data}|{reference_time or ''}".encode()).hexdigest()
+
+
+def build_payload(
     data: str,
     tenant_id: str,
     reference_time: Optional[str] = None,
@@ -29,20 +162,7 @@ def ingest_event(
     customer_id: Optional[str] = None,
     customer_name: Optional[str] = None
 ) -> Dict[str, Any]:
-    """
-    Ingest a single event into the knowledge graph.
-    
-    Args:
-        data: The event data (natural language description)
-        tenant_id: Tenant identifier for multi-tenant isolation
-        reference_time: ISO 8601 timestamp of when the event occurred
-        context: Additional context to help with entity extraction
-        customer_id: Optional customer/entity ID for enhanced matching
-        customer_name: Optional customer/entity name for enhanced matching
-    
-    Returns:
-        API response as dictionary
-    """
+    """Build the request body for a single event (one /ingest/batch item)."""
     payload = {
         "data": data,
         "tenant_id": tenant_id
@@ -54,97 +174,108 @@ def ingest_event(
     if context:
         payload["context"] = context
     
-    # Add customer context if provided
-    if customer_id or customer_name:
-        payload["customer_context"] = {}
-        if customer_id:
-            payload["customer_context"]["customer_id"] = customer_id
-        if customer_name:
-            payload["customer_context"]["customer_name"] = customer_name
-    
-    response = requests.post(f"{API_BASE_URL}/ingest", json=payload)
-    response.raise_for_status()
-    return response.json()
+    # Add customer context if provided (fixed key order keeps the body canonical)
+    customer_context = {k: v for k, v in (("customer_id", customer_id), ("customer_name", customer_name)) if v}
+    if customer_context:
+        payload["customer_context"] = customer_context
+
+    return payload
+
+
+async def ingest_batch_async(
+    session: aiohttp.ClientSession,
+    tenant_id: str,
+    events: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Ingest several events in one POST /ingest/batch request.
 
+    Args:
+        session: Shared aiohttp session
+        tenant_id: Tenant identifier for multi-tenant isolation
+        events: Keyword arguments for build_payload, one dict per event
 
-def generate_sample_events(tenant_id: str, num_events: int = 10):
+    Returns:
+        Per-event API results, in input order
+    """
+    items = [build_payload(tenant_id=tenant_id, **event) for event in events]
+    batch_key = hashlib.sha256("\n".join(
+        idempotency_key(tenant_id, event["data"], event.get("reference_time")) for event in events
+    ).encode()).hexdigest()
+    headers = {**JSON_HEADERS, "Idempotency-Key": batch_key}
+    # The events form a timeline (a promotion supersedes the earlier role), so they
+    # take the per-episode path, which keeps temporal edge invalidation
+    body = orjson.dumps({"items": items, "bulk": False})
+    async with session.post(f"{API_BASE_URL}/ingest/batch", data=body, headers=headers) as response:
+        if response.status >= 400:
+            raise APIError(response.status, (await response.read())[:512])
+        return orjson.loads(await response.read())["results"]
+
+
+async def generate_sample_events(tenant_id: str, num_events: int = 10, verbose: bool = True):
     """
     Generate and ingest sample events demonstrating various scenarios.
+
+    Events are produced by cycling through EVENTS; each full cycle is placed
+    in its own 30-day window so the timeline stays ordered and ends near today.
+    They are sent through the batch endpoint, which ingests them in order as
+    separate episodes; batches of up to BATCH_SIZE are sent one after another
+    so the tenant's episodes never overlap.
     
     Args:
         tenant_id: Tenant identifier
         num_events: Number of events to generate
+        verbose: Print a line per ingested event
     """
     print(f"\n🚀 Starting data ingestion for tenant: {tenant_id}")
     print(f"📊 Generating {num_events} sample events...\n")
-    
-    base_time = datetime.now() - timedelta(days=30)
-    
-    # Example 1: Employee onboarding
-    print("Event 1: Employee onboarding...")
-    result = ingest_event(
-        data="Sarah Johnson joined TechCorp as Senior Software Engineer in the Engineering department",
-        tenant_id=tenant_id,
-        reference_time=(base_time + timedelta(days=0)).isoformat(),
-        context="Employee onboarding event"
-    )
-    print(f"✅ Ingested: {result.get('message', 'Success')}\n")
-    
-    # Example 2: Project assignment with customer context
-    print("Event 2: Project assignment...")
-    result = ingest_event(
-        data="Sarah Johnson was assigned to lead the Cloud Migration project for Acme Corp",
-        tenant_id=tenant_id,
-        reference_time=(base_time + timedelta(days=5)).isoformat(),
-        context="Project assignment",
-        customer_id="CUST001",
-        customer_name="Acme Corp"
-    )
-    print(f"✅ Ingested: {result.get('message', 'Success')}\n")
-    
-    # Example 3: Meeting event
-    print("Event 3: Team meeting...")
-    result = ingest_event(
-        data="Sarah Johnson and Michael Chen had a planning meeting to discuss the Cloud Migration architecture",
-        tenant_id=tenant_id,
-        reference_time=(base_time + timedelta(days=7)).isoformat(),
-        context="Team collaboration meeting"
-    )
-    print(f"✅ Ingested: {result.get('message', 'Success')}\n")
-    
-    # Example 4: Customer interaction
-    print("Event 4: Customer interaction...")
-    result = ingest_event(
-        data="Michael Chen presented the Cloud Migration proposal to Acme Corp stakeholders",
-        tenant_id=tenant_id,
-        reference_time=(base_time + timedelta(days=10)).isoformat(),
-        context="Customer presentation",
-        customer_id="CUST001",
-        customer_name="Acme Corp"
-    )
-    print(f"✅ Ingested: {result.get('message', 'Success')}\n")
-    
-    # Example 5: Project milestone
-    print("Event 5: Project milestone...")
-    result = ingest_event(
-        data="The Cloud Migration project completed Phase 1 successfully with all deliverables met",
-        tenant_id=tenant_id,
-        reference_time=(base_time + timedelta(days=20)).isoformat(),
-        context="Project milestone achievement"
-    )
-    print(f"✅ Ingested: {result.get('message', 'Success')}\n")
-    
-    # Example 6: Employee promotion
-    print("Event 6: Employee promotion...")
-    result = ingest_event(
-        data="Sarah Johnson was promoted to Engineering Manager due to excellent performance on the Cloud Migration project",
-        tenant_id=tenant_id,
-        reference_time=(base_time + timedelta(days=25)).isoformat(),
-        context="Employee promotion event"
-    )
-    print(f"✅ Ingested: {result.get('message', 'Success')}\n")
-    
-    print(f"✅ Successfully ingested {6} events for tenant {tenant_id}")
+
+    # Precompute every reference time up front. Events fall on midnight of their
+    # day, so the ISO strings are plain date arithmetic and re-running the script
+    # on the same day reproduces identical events (and idempotency keys).
+    num_templates = len(EVENTS)
+    num_cycles = -(-num_events // num_templates)
+    base_ordinal = date.today().toordinal() - CYCLE_DAYS * num_cycles
+    reference_times = [
+        date.fromordinal(base_ordinal + EVENTS[i % num_templates]["days"] + CYCLE_DAYS * (i // num_templates)).isoformat()
+        + "T00:00:00"
+        for i in range(num_events)
+    ]
+
+    events = []
+    for i, reference_time in enumerate(reference_times):
+        template = EVENTS[i % num_templates]
+        events.append(dict(
+            data=template["data"],
+            reference_time=reference_time,
+            context=template["context"],
+            customer_id=template["customer_id"],
+            customer_name=template["customer_name"]
+        ))
+
+    connector = aiohttp.TCPConnector(limit=16, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(sock_connect=REQUEST_TIMEOUT[0], sock_read=REQUEST_TIMEOUT[1])
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        results = []
+        for i in range(0, len(events), BATCH_SIZE):
+            results.extend(await ingest_batch_async(session, tenant_id, events[i:i + BATCH_SIZE]))
+
+    # A batch can partly succeed; failed items come back with status "error"
+    failed = [i for i, result in enumerate(results, 1) if result.get("status") == "error"]
+    if verbose:
+        for i, (event, result) in enumerate(zip(events, results), 1):
+            print(f"Event {i}: {event['context']}...")
+            if result.get("status") == "error":
+                print(f"❌ Failed: {result.get('error')}\n")
+            else:
+                print(f"✅ Ingested: {result.get('message', 'Success')}\n")
+
+    print(f"✅ Successfully ingested {len(results) - len(failed)} events for tenant {tenant_id}")
+    if failed:
+        print(f"⚠️  {len(failed)} events failed: {failed}")
+
+    # Re-warm the server's search cache now that the tenant's data has changed
+    warm_search_cache(tenant_id)
     print(f"\n💡 You can now query this data using:")
     print(f"   python examples/general_queries.py --tenant-id {tenant_id}")
 
@@ -153,15 +284,19 @@ def main():
     parser = argparse.ArgumentParser(description="General data ingestion example")
     parser.add_argument("--tenant-id", default="TENANT001", help="Tenant ID for multi-tenant isolation")
     parser.add_argument("--num-events", type=int, default=6, help="Number of events to generate")
+    parser.add_argument("--verbose", action="store_true", help="Print a line for every ingested event")
     
     args = parser.parse_args()
     
     try:
-        generate_sample_events(args.tenant_id, args.num_events)
-    except requests.exceptions.ConnectionError:
+        asyncio.run(generate_sample_events(args.tenant_id, args.num_events, args.verbose))
+    except (requests.exceptions.ConnectionError, aiohttp.ClientConnectorError):
         print("❌ Error: Could not connect to API. Make sure the server is running:")
         print("   python -m uvicorn src.api.routes:app --host 0.0.0.0 --port 8000")
-    except Exception as e:
+    except asyncio.TimeoutError:
+        print(f"❌ Error: Timed out waiting for a batch of up to {BATCH_SIZE} events.")
+        print("   The server may still be ingesting it; completed batches are not re-ingested on a re-run.")
+    except APIError as e:
         print(f"❌ Error: {e}")
 
 
@@ -12,23 +12,103 @@ Usage:
 """
 
 import argparse
-import json
+import asyncio
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+from dataclasses import dataclass
 from typing import Dict, Any, Optional
 
 
 API_BASE_URL = "http://localhost:8000"
 
+# (connect, read) timeouts in seconds - reads allow for server-side LLM extraction
+REQUEST_TIMEOUT = (3.05, 90)
 
-def search(
+# Request bodies are pre-encoded with orjson, so the content type is set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Ask /search to stream NDJSON so we can stop reading after the printed results
+NDJSON_HEADERS = {**JSON_HEADERS, "Accept": "application/x-ndjson"}
+
+# Number of results print_results shows per query
+PRINTED_RESULTS = 5
+
+
+@dataclass
+class APIError(Exception):
+    """Error response (HTTP status >= 400) returned by the API."""
+    status_code: int
+    body: bytes
+
+    def __str__(self) -> str:
+        return f"API returned HTTP {self.status_code}: {self.body.decode(errors='replace')}"
+
+
+def _create_session() -> requests.Session:
+    """Create a shared HTTP session with keep-alive connection pooling and retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        # POSTs are retried too: this client only POSTs /search, which is read-only
+        max_retries=Retry(
+            total=3,
+            connect=3,
+            read=3,
+            backoff_factor=0.25,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST"])
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Advertise every content encoding urllib3 can decode (adds br when brotli is installed)
+    session.headers.update(make_headers(accept_encoding=True))
+    return session
+
+
+# Reused across all calls so the underlying TCP connections are kept alive
+_SESSION = _create_session()
+
+
+def build_payload(
     query: str,
     tenant_id: str,
     num_results: int = 10,
     customer_id: Optional[str] = None,
     customer_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the /search request body for a single query."""
+    payload = {
+        "query": query,
+        "tenant_id": tenant_id,
+        "num_results": num_results
+    }
+    
+    # Add customer context if provided (fixed key order keeps the body canonical)
+    customer_context = {k: v for k, v in (("customer_id", customer_id), ("customer_name", customer_name)) if v}
+    if customer_context:
+        payload["customer_context"] = customer_context
+
+    return payload
+
+
+def search(
+    query: str,
+    tenant_id: str,
+    num_results: int = 10,
+    customer_id: Optional[str] = None,
+    customer_name: Optional[str] = None,
+    max_results: int = PRINTED_RESULTS
 ) -> Dict[str, Any]:
     """
     Search the knowledge graph.
+
+    The response is streamed as NDJSON and reading stops after max_results.
     
     Args:
         query: Natural language query
@@ -36,27 +116,65 @@ def search(
         num_results: Number of results to return
         customer_id: Optional customer/entity ID for context
         customer_name: Optional customer/entity name for context
+        max_results: Maximum number of results to read from the stream
     
     Returns:
         API response as dictionary
     """
-    payload = {
-        "query": query,
-        "tenant_id": tenant_id,
-        "num_results": num_results
-    }
-    
-    # Add customer context if provided
-    if customer_id or customer_name:
-        payload["customer_context"] = {}
-        if customer_id:
-            payload["customer_context"]["customer_id"] = customer_id
-        if customer_name:
-            payload["customer_context"]["customer_name"] = customer_name
-    
-    response = requests.post(f"{API_BASE_URL}/search", json=payload)
-    response.raise_for_status()
-    return response.json()
+    payload = build_payload(query, tenant_id, num_results, customer_id, customer_name)
+    with _SESSION.post(
+        f"{API_BASE_URL}/search",
+        data=orjson.dumps(payload),
+        headers=NDJSON_HEADERS,
+        timeout=REQUEST_TIMEOUT,
+        stream=True
+    ) as response:
+        if response.status_code >= 400:
+            raise APIError(response.status_code, response.content[:512])
+        lines = response.iter_lines()
+        results = orjson.loads(next(lines))
+        results["results"] = []
+        for line in lines:
+            if len(results["results"]) >= max_results:
+                break
+            if line:
+                results["results"].append(orjson.loads(line))
+    return results
+
+
+async def search_async(
+    session: aiohttp.ClientSession,
+    query: str,
+    tenant_id: str,
+    num_results: int = 10,
+    customer_id: Optional[str] = None,
+    customer_name: Optional[str] = None,
+    max_results: int = PRINTED_RESULTS
+) -> Dict[str, Any]:
+    """
+    Search the knowledge graph using a shared aiohttp session.
+
+    Same arguments as search, plus the session the request is sent on.
+
+    Returns:
+        API response as dictionary
+    """
+    payload = build_payload(query, tenant_id, num_results, customer_id, customer_name)
+    async with session.post(
+        f"{API_BASE_URL}/search",
+        data=orjson.dumps(payload),
+        headers=NDJSON_HEADERS
+    ) as response:
+        if response.status >= 400:
+            raise APIError(response.status, (await response.read())[:512])
+        results = orjson.loads(await response.content.readline())
+        results["results"] = []
+        async for line in response.content:
+            if len(results["results"]) >= max_results:
+                break
+            if line.strip():
+                results["results"].append(orjson.loads(line))
+    return results
 
 
 def print_results(query: str, results: Dict[str, Any]):
@@ -66,12 +184,12 @@ def print_results(query: str, results: Dict[str, Any]):
     print(f"{'='*80}")
     
     if "results" in results and results["results"]:
-        for i, result in enumerate(results["results"][:5], 1):
+        for i, result in enumerate(results["results"][:PRINTED_RESULTS], 1):
             # Our API returns "fact" and "name" fields (see SearchService),
             # not "content". Prefer fact, then name, then a JSON fallback.
             primary_text = result.get("fact") or result.get("name")
             if not primary_text:
-                primary_text = json.dumps(result, ensure_ascii=False)
+                primary_text = orjson.dumps(result).decode()
 
             print(f"\n{i}. {primary_text}")
 
@@ -88,57 +206,43 @@ def print_results(query: str, results: Dict[str, Any]):
     print(f"\n{'='*80}\n")
 
 
-def run_example_queries(tenant_id: str):
-    """Run example queries demonstrating various scenarios."""
+async def run_example_queries(tenant_id: str):
+    """Run example queries demonstrating various scenarios.
+
+    The queries are independent, so they are sent concurrently and printed
+    in order once all of them have completed.
+    """
     
     print(f"\n🔍 Running example queries for tenant: {tenant_id}\n")
-    
-    # Query 1: Employee information
-    print("Query 1: Employee information")
-    results = search(
-        query="Tell me about Sarah Johnson",
-        tenant_id=tenant_id,
-        num_results=10
-    )
-    print_results("Tell me about Sarah Johnson", results)
-    
-    # Query 2: Project information
-    print("Query 2: Project information")
-    results = search(
-        query="What is the Cloud Migration project?",
-        tenant_id=tenant_id,
-        num_results=10
-    )
-    print_results("What is the Cloud Migration project?", results)
-    
-    # Query 3: Customer-specific query with context
-    print("Query 3: Customer-specific query with context")
-    results = search(
-        query="What work was done for Acme Corp?",
-        tenant_id=tenant_id,
-        num_results=10,
-        customer_id="CUST001",
-        customer_name="Acme Corp"
-    )
-    print_results("What work was done for Acme Corp?", results)
-    
-    # Query 4: Team collaboration
-    print("Query 4: Team collaboration")
-    results = search(
-        query="Who worked with Sarah Johnson?",
-        tenant_id=tenant_id,
-        num_results=10
-    )
-    print_results("Who worked with Sarah Johnson?", results)
-    
-    # Query 5: Temporal query
-    print("Query 5: Temporal query")
-    results = search(
-        query="What happened with Sarah Johnson's career?",
-        tenant_id=tenant_id,
-        num_results=10
-    )
-    print_results("What happened with Sarah Johnson's career?", results)
+
+    queries = [
+        # Query 1: Employee information
+        ("Employee information", dict(query="Tell me about Sarah Johnson")),
+        # Query 2: Project information
+        ("Project information", dict(query="What is the Cloud Migration project?")),
+        # Query 3: Customer-specific query with context
+        ("Customer-specific query with context", dict(
+            query="What work was done for Acme Corp?",
+            customer_id="CUST001",
+            customer_name="Acme Corp"
+        )),
+        # Query 4: Team collaboration
+        ("Team collaboration", dict(query="Who worked with Sarah Johnson?")),
+        # Query 5: Temporal query
+        ("Temporal query", dict(query="What happened with Sarah Johnson's career?")),
+    ]
+
+    connector = aiohttp.TCPConnector(limit=16, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(sock_connect=REQUEST_TIMEOUT[0], sock_read=REQUEST_TIMEOUT[1])
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        all_results = await asyncio.gather(*[
+            search_async(session, tenant_id=tenant_id, num_results=10, **params)
+            for _, params in queries
+        ])
+
+    for i, ((label, params), results) in enumerate(zip(queries, all_results), 1):
+        print(f"Query {i}: {label}")
+        print_results(params["query"], results)
     
     print("✅ All example queries completed!")
 
@@ -164,12 +268,12 @@ def main():
             print_results(args.query, results)
         else:
             # Run example queries
-            run_example_queries(args.tenant_id)
+            asyncio.run(run_example_queries(args.tenant_id))
     
-    except requests.exceptions.ConnectionError:
+    except (requests.exceptions.ConnectionError, aiohttp.ClientConnectorError):
         print("❌ Error: Could not connect to API. Make sure the server is running:")
         print("   python -m uvicorn src.api.routes:app --host 0.0.0.0 --port 8000")
-    except Exception as e:
+    except APIError as e:
         print(f"❌ Error: {e}")
 
 
@@ -1,9 +1,10 @@
 """API module for Temporal Knowledge Graph RAG"""
-from .models import DataIngestion, SearchQuery
+from .models import DataIngestion, BatchIngestion, SearchQuery
 from .routes import create_app
 
 __all__ = [
     "DataIngestion",
+    "BatchIngestion",
     "SearchQuery",
     "create_app",
 ]
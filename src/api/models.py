@@ -1,10 +1,17 @@
 """Pydantic models for API"""
-from typing import Optional, Dict, Any, Union, List
-from pydantic import BaseModel, Field
+from typing import Annotated, Optional, Dict, Any, Union, List
+from pydantic import BaseModel, ConfigDict, Field, StrictStr
+
+# Input size limits - bound validation work and the LLM tokens spent per request
+MAX_DATA_LENGTH = 8192  # characters of text data
+MAX_DATA_ITEMS = 1000  # top-level keys/items of JSON data
+MAX_QUERY_LENGTH = 1024
 
 
 class TenantContext(BaseModel):
 	"""Tenant context for multi-tenant isolation"""
+	model_config = ConfigDict(extra="ignore", frozen=False, validate_assignment=False)
+
 	tenant_id: str = Field(..., description="Tenant ID (e.g., 'TENANT001') - Required for isolation")
 	tenant_name: Optional[str] = Field(None, description="Tenant name (e.g., 'Premium Org')")
 	tenant_address: Optional[str] = Field(None, description="Tenant address")
@@ -12,6 +19,9 @@ class TenantContext(BaseModel):
 
 class CustomerContext(BaseModel):
     """Customer context for enhanced entity matching"""
+    # Unknown keys are rejected rather than silently dropped so cached request bodies stay canonical
+    model_config = ConfigDict(extra="forbid", frozen=False, validate_assignment=False)
+
     customer_id: Optional[str] = Field(None, description="Customer ID (e.g., 'CUST001')")
     customer_name: Optional[str] = Field(None, description="Customer name (e.g., 'John Anderson')")
     customer_address: Optional[str] = Field(None, description="Customer address")
@@ -19,8 +29,16 @@ class CustomerContext(BaseModel):
 
 class DataIngestion(BaseModel):
     """Schema-less data ingestion model"""
-    data: Union[str, Dict[str, Any], List[Any]] = Field(
+    model_config = ConfigDict(extra="ignore", frozen=False, validate_assignment=False, str_strip_whitespace=True)
+
+    # Text is by far the most common payload, so it is tried first
+    data: Union[
+        Annotated[StrictStr, Field(min_length=1, max_length=MAX_DATA_LENGTH)],
+        Annotated[Dict[str, Any], Field(max_length=MAX_DATA_ITEMS)],
+        Annotated[List[Any], Field(max_length=MAX_DATA_ITEMS)],
+    ] = Field(
         ...,
+        union_mode="left_to_right",
         description="Raw data in any format: text, JSON object, or array"
     )
     reference_time: Optional[str] = Field(
@@ -45,9 +63,28 @@ class DataIngestion(BaseModel):
     )
 
 
+class BatchIngestion(BaseModel):
+    """Batch of schema-less ingestion items submitted in one request"""
+    model_config = ConfigDict(extra="ignore", frozen=False, validate_assignment=False)
+
+    items: List[DataIngestion] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Items to ingest; items are grouped by tenant and extracted together"
+    )
+    bulk: bool = Field(
+        default=True,
+        description="If True, each tenant's items are extracted in one bulk call (faster, but without temporal edge invalidation); "
+                    "if False, every item goes through the full per-episode pipeline, one tenant's items at a time"
+    )
+
+
 class SearchQuery(BaseModel):
     """Search query model"""
-    query: str = Field(..., description="Search query text (natural language)")
+    model_config = ConfigDict(extra="ignore", frozen=False, validate_assignment=False, str_strip_whitespace=True)
+
+    query: StrictStr = Field(..., min_length=1, max_length=MAX_QUERY_LENGTH, description="Search query text (natural language)")
     num_results: int = Field(default=5, ge=1, le=20, description="Number of results to return")
     group_ids: Optional[List[str]] = Field(None, description="Optional group IDs to filter by (auto-populated from tenant_id/tenant_context if not provided)")
     min_score: float = Field(default=0.7, ge=0.0, le=1.0, description="Minimum similarity score threshold (0.0-1.0). Higher values = more relevant results.")
@@ -1,47 +1,413 @@
 """FastAPI routes for Temporal Knowledge Graph RAG"""
+import asyncio
+import hashlib
+import json
+import logging
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from prometheus_fastapi_instrumentator import Instrumentator
 
-from .models import DataIngestion, SearchQuery
-from src.core import get_graphiti_instance, close_graphiti_instance, Config
+from .models import DataIngestion, BatchIngestion, SearchQuery
+from src.core import get_graphiti_instance, close_graphiti_instance, batching_scope, run_read, Config
+from src.core.log import LOGGER_NAME, setup_logging, stop_logging
 from src.services import DataIngestionService, SearchService, ExportService
+from src.utils import TTLCache, json_default
 
 
+logger = logging.getLogger(LOGGER_NAME)
+
 # Global instance
 graphiti_instance = None
 ingestion_service = None
 search_service = None
 export_service = None
 
+# Reported by /health; updated by lifespan rather than checked per request
+_graphiti_status = "disconnected"
+
+# Static / payload, serialized once
+ROOT_RESPONSE = orjson.dumps({
+    "name": "Temporal Knowledge Graph RAG API",
+    "version": Config.API_VERSION,
+    "description": "Schema-less temporal knowledge graph with bi-temporal model",
+    "endpoints": {
+        "health": "/health",
+        "ingest": "/ingest",
+        "ingest_batch": "/ingest/batch",
+        "search": "/search",
+        "episodes": "/episodes",
+        "entities": "/entities",
+        "stats": "/stats",
+        "build_communities": "/build-communities",
+        "communities": "/communities",
+        "metrics": "/metrics"
+    }
+})
+
+# Search response cache, invalidated per tenant by bumping a version on ingestion
+_search_cache = TTLCache(maxsize=Config.SEARCH_CACHE_SIZE, ttl=Config.SEARCH_CACHE_TTL)
+_cache_versions = defaultdict(int)
+
+# Graph-wide /stats payload, reused for a few seconds and dropped on ingestion
+_stats_cache = TTLCache(maxsize=1, ttl=Config.STATS_CACHE_TTL)
+
+# Stored /ingest responses keyed by (path, Idempotency-Key header)
+_idempotent_responses = TTLCache(maxsize=Config.IDEMPOTENCY_CACHE_SIZE, ttl=Config.IDEMPOTENCY_CACHE_TTL)
+IDEMPOTENT_PATHS = frozenset({"/ingest", "/ingest/batch"})
+
+# Canonical demo queries (see examples/general_queries.py) used to warm the search cache
+WARMUP_QUERIES = [
+    {"query": "Tell me about Sarah Johnson"},
+    {"query": "What is the Cloud Migration project?"},
+    {
+        "query": "What work was done for Acme Corp?",
+        "customer_context": {"customer_id": "CUST001", "customer_name": "Acme Corp"},
+    },
+    {"query": "Who worked with Sarah Johnson?"},
+    {"query": "What happened with Sarah Johnson's career?"},
+]
+
+
+# Lowercase substrings used to classify ingestion failures
+_RATE_LIMIT_MARKERS = ("rate limit", "quota", "too many requests")
+_AUTH_ERROR_MARKERS = ("authentication", "api key", "unauthorized")
+_TIMEOUT_MARKERS = ("timeout", "timed out")
+
+
+def _etag_response(request: Request, payload) -> Response:
+    """Serialize payload with a weak ETag, answering 304 when the client already has it"""
+    body = orjson.dumps(payload, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=5"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _parse_reference_time(reference_time: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 reference time (accepts a trailing 'Z')"""
+    if not reference_time:
+        return None
+    return datetime.fromisoformat(reference_time.replace('Z', '+00:00'))
+
+
+# (attribute, label, always included) for the context sentences added per model
+_CONTEXT_SEPARATOR = ". "
+_TENANT_CONTEXT_FIELDS = (
+    ("tenant_id", "Tenant ID: ", True),
+    ("tenant_name", "Tenant Name: ", False),
+    ("tenant_address", "Tenant Address: ", False),
+)
+_CUSTOMER_CONTEXT_FIELDS = (
+    ("customer_id", "Customer ID: ", False),
+    ("customer_name", "Customer: ", False),
+    ("customer_address", "Customer Address: ", False),
+)
+
+
+def _build_context(ingestion: DataIngestion) -> Optional[str]:
+    """Build extraction context from free-form context plus tenant/customer information
+
+    Separators, labels and values are collected flat and joined once.
+    """
+    pieces = []
+    if ingestion.context:
+        pieces += (_CONTEXT_SEPARATOR, ingestion.context)
+
+    for source, fields in (
+        (ingestion.tenant_context, _TENANT_CONTEXT_FIELDS),
+        (ingestion.customer_context, _CUSTOMER_CONTEXT_FIELDS),
+    ):
+        if source is None:
+            continue
+        for attribute, label, required in fields:
+            value = getattr(source, attribute)
+            if value or required:
+                pieces += (_CONTEXT_SEPARATOR, label, value)
+
+    # Drop the leading separator
+    return "".join(pieces[1:]) if pieces else None
+
+
+def _resolve_group_ids(ingestion: DataIngestion) -> Optional[List[str]]:
+    """Determine group_ids for tenant isolation
+
+    Priority: tenant_context.tenant_id > tenant_id field
+    """
+    tenant_id = ingestion.tenant_context.tenant_id if ingestion.tenant_context else ingestion.tenant_id
+    return [tenant_id] if tenant_id else None
+
+
+def _ingestion_error_response(e: Exception):
+    """Translate an ingestion failure into an API error response"""
+    error_msg = str(e)
+    lowered = error_msg.lower()
+    
+    # Handle rate limit errors
+    if any(x in lowered for x in _RATE_LIMIT_MARKERS):
+        return ORJSONResponse(
+            status_code=429,
+            content={
+                "error": "Rate Limit Exceeded",
+                "message": error_msg,
+                "suggestion": "Please wait a moment and try again. If you continue to see rate limit errors, reduce request frequency or batch size, or review your OpenAI rate limits.",
+                "original_error": error_msg
+            }
+        )
+    
+    # Handle authentication errors
+    if any(x in lowered for x in _AUTH_ERROR_MARKERS):
+        return ORJSONResponse(
+            status_code=401,
+            content={
+                "error": "Authentication Error",
+                "message": "Invalid or missing OpenAI API key",
+                "suggestion": "Check your OPENAI_API_KEY in the .env file or environment variables.",
+                "original_error": error_msg
+            }
+        )
+    
+    # Handle timeout errors
+    if any(x in lowered for x in _TIMEOUT_MARKERS):
+        return ORJSONResponse(
+            status_code=504,
+            content={
+                "error": "Timeout Error",
+                "message": "Request timed out",
+                "suggestion": "Try with smaller data or retry later",
+                "original_error": error_msg
+            }
+        )
+    
+    # Generic error
+    raise HTTPException(status_code=500, detail=f"Ingestion failed: {error_msg}")
+
+
+def _search_cache_key(query: SearchQuery, group_ids: Optional[List[str]]) -> str:
+    """Stable cache key for a search request
+
+    Whitespace in the query text is normalized. Scoped searches mix in the
+    versions of their own tenants only, so ingesting into one tenant leaves
+    other tenants' cached results valid; unscoped searches use the global version.
+    """
+    params = query.model_dump()
+    params["query"] = " ".join(query.query.split())
+    params["versions"] = [_cache_versions[g] for g in group_ids] if group_ids else [_cache_versions[None]]
+    return hashlib.blake2b(
+        json.dumps(params, sort_keys=True).encode(),
+        digest_size=16
+    ).hexdigest()
+
+
+def _invalidate_search_cache(group_ids: Optional[List[str]]) -> None:
+    """Invalidate cached search results affected by an ingestion into group_ids
+
+    Unscoped searches read every tenant, so the global version is always bumped
+    along with the versions of the tenants written to.
+    """
+    _cache_versions[None] += 1
+    for group_id in group_ids or []:
+        _cache_versions[group_id] += 1
+    _stats_cache.clear()
+
+    if search_service:
+        search_service.invalidate_cache(group_ids)
+
+
+async def _ingest_batch_per_episode(batch: BatchIngestion):
+    """Run /ingest/batch items through add_episode (serialized per tenant, concurrent across tenants)"""
+    items = [
+        {
+            "data": ingestion.data,
+            "reference_time": _parse_reference_time(ingestion.reference_time),
+            "context": _build_context(ingestion),
+            "group_ids": _resolve_group_ids(ingestion),
+        }
+        for ingestion in batch.items
+    ]
+    results = await ingestion_service.ingest_batch(items)
+
+    for group_id in {item["group_ids"][0] if item["group_ids"] else None for item in items}:
+        _invalidate_search_cache([group_id] if group_id else None)
+
+    failed = [result for result in results if result["status"] == "error"]
+    if len(failed) == len(results):
+        # No item succeeded, so the request fails as a whole and can be retried
+        return _ingestion_error_response(RuntimeError(failed[0]["error"]))
+
+    return {
+        "status": "partial" if failed else "success",
+        "count": len(results),
+        "results": results
+    }
+
+
+async def _search_impl(query: SearchQuery) -> dict:
+    """Run a search request, serving repeated identical requests from the response cache"""
+    # Determine group_ids for tenant isolation (optional)
+    # Priority: explicit group_ids > tenant_context.tenant_id > tenant_id field
+    group_ids = query.group_ids
+    if not group_ids:
+        if query.tenant_context:
+            group_ids = [query.tenant_context.tenant_id]
+            logger.debug("🏢 Tenant isolation: Filtering by tenant_id=%s", query.tenant_context.tenant_id)
+        elif query.tenant_id:
+            group_ids = [query.tenant_id]
+            logger.debug("🏢 Tenant isolation: Filtering by tenant_id=%s", query.tenant_id)
+
+    cache_key = _search_cache_key(query, group_ids)
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Enhance query with customer and tenant context if provided
+    enhanced_query = query.query
+    context_hints = []
+
+    # Add customer context hints
+    if query.customer_context and query.customer_context.customer_name:
+        context_hints.append(query.customer_context.customer_name)
+
+    # Add tenant context hints
+    if query.tenant_context and query.tenant_context.tenant_name:
+        context_hints.append(query.tenant_context.tenant_name)
+
+    # Add context hints to query for better entity matching
+    if context_hints and query.enhance_query:
+        enhanced_query = f"{query.query} {' '.join(context_hints)}"
+        logger.debug("🔍 Enhanced query with context: %s", enhanced_query)
+
+    search_result = await search_service.search(
+        query=enhanced_query,
+        num_results=query.num_results,
+        group_ids=group_ids,
+        min_score=query.min_score,
+        use_entity_filter=query.use_entity_filter,
+        enhance_query=query.enhance_query
+    )
+
+    # Extract transformation metadata and results
+    transformation = search_result.get("transformation", {})
+    results = search_result.get("results", [])
+
+    response = {
+        "query": query.query,
+        "num_results": len(results),
+        "min_score": query.min_score,
+        "tenant_id": query.tenant_id,
+        "tenant_context": query.tenant_context.model_dump() if query.tenant_context else None,
+        "customer_context": query.customer_context.model_dump() if query.customer_context else None,
+        "group_ids": group_ids,
+        "transformation": transformation,
+        "results": results
+    }
+
+    _search_cache.set(cache_key, response)
+    return response
+
+def _ndjson_iter(response: dict):
+    """Yield a search response as NDJSON: the envelope without results, then one line per hit"""
+    envelope = {key: value for key, value in response.items() if key != "results"}
+    yield orjson.dumps(envelope) + b"\n"
+    for result in response["results"]:
+        yield orjson.dumps(result) + b"\n"
+
+
+async def _stream_page(query: str, key: str, offset: int, limit: int) -> StreamingResponse:
+    """Run a paginated read and stream its records as one incremental JSON document
+
+    The query is started before returning so driver errors still surface as a 500;
+    the session then stays open for the lifetime of the body generator. "total" is
+    written after the array because it is only known once every row has been sent.
+    """
+    session = graphiti_instance.driver.session()
+    try:
+        result = await session.run(query, offset=offset, limit=limit)
+    except Exception:
+        await session.close()
+        raise
+
+    async def body():
+        try:
+            yield b'{"offset":%d,"limit":%d,"%s":[' % (offset, limit, key.encode())
+            # Records are tuples; zip them with the keys once per row instead of
+            # going through record.data()'s per-value conversion
+            keys = await result.keys()
+            total = 0
+            async for record in result:
+                if total:
+                    yield b","
+                yield orjson.dumps(dict(zip(keys, record)), default=json_default)
+                total += 1
+            yield b'],"total":%d}' % total
+        finally:
+            await session.close()
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+async def _warm_search_cache(tenant_ids: List[str]) -> int:
+    """Run the warm-up queries for each tenant so their responses land in the search cache
+
+    Returns:
+        Number of queries that completed successfully
+    """
+    warmed = 0
+    for tenant_id in tenant_ids:
+        for params in WARMUP_QUERIES:
+            try:
+                await _search_impl(SearchQuery(tenant_id=tenant_id, num_results=10, **params))
+                warmed += 1
+            except Exception as e:
+                logger.warning("⚠️  Cache warm-up query failed for tenant %s: %s", tenant_id, e)
+    return warmed
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle management for FastAPI"""
-    global graphiti_instance, ingestion_service, search_service, export_service
+    global graphiti_instance, ingestion_service, search_service, export_service, _graphiti_status
     
-    print("🚀 Starting Temporal Knowledge Graph RAG API...")
+    setup_logging()
+    logger.info("🚀 Starting Temporal Knowledge Graph RAG API...")
+
+    warmup_task = None
     
     try:
         # Initialize Graphiti
-        graphiti_instance = get_graphiti_instance()
+        graphiti_instance = await get_graphiti_instance()
         
         # Initialize services
         ingestion_service = DataIngestionService(graphiti_instance)
         search_service = SearchService(graphiti_instance)
         export_service = ExportService(graphiti_instance)
+        _graphiti_status = "connected"
         
-        print("✅ API initialized successfully")
+        logger.info("✅ API initialized successfully")
+
+        # Warm the search cache in the background so startup is not blocked on LLM calls
+        if Config.WARMUP_TENANTS:
+            warmup_task = asyncio.create_task(_warm_search_cache(Config.WARMUP_TENANTS))
         
         yield
         
     finally:
-        print("🛑 Shutting down API...")
+        logger.info("🛑 Shutting down API...")
+        if warmup_task and not warmup_task.done():
+            warmup_task.cancel()
+        _graphiti_status = "disconnected"
         await close_graphiti_instance()
-        print("✅ Shutdown complete")
+        logger.info("✅ Shutdown complete")
+        stop_logging()
 
 
 def create_app() -> FastAPI:
@@ -51,36 +417,65 @@ def create_app() -> FastAPI:
         title="Temporal Knowledge Graph RAG API",
         description="Schema-less temporal knowledge graph with runtime entity extraction",
         version=Config.API_VERSION,
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
     )
+
+    @app.middleware("http")
+    async def idempotency(request: Request, call_next):
+        """Replay the stored response for an ingestion retried with the same Idempotency-Key
+
+        Re-submitting the same event is safe to short-circuit, and skips the
+        LLM extraction and graph writes the original request already paid for.
+        """
+        key = request.headers.get("idempotency-key")
+        if not key or request.method != "POST" or request.url.path not in IDEMPOTENT_PATHS:
+            return await call_next(request)
+
+        cache_key = (request.url.path, key)
+        cached = _idempotent_responses.get(cache_key)
+        if cached is not None:
+            status_code, body, media_type = cached
+            return Response(
+                content=body,
+                status_code=status_code,
+                media_type=media_type,
+                headers={"Idempotent-Replayed": "true"}
+            )
+
+        response = await call_next(request)
+        if response.status_code != 201:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        _idempotent_responses.set(cache_key, (response.status_code, body, response.media_type))
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            media_type=response.media_type
+        )
+
+    # Compress larger responses (search results, listings); small /ingest replies stay uncompressed.
+    # Added after the idempotency middleware so it wraps it and stored bodies stay uncompressed.
+    app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
+    # Per-route request counts and latency histograms, scraped from /metrics
+    Instrumentator(excluded_handlers=["/metrics"]).instrument(app).expose(app, include_in_schema=False)
     
     @app.get("/")
     async def root():
         """Root endpoint - API information"""
-        return {
-            "name": "Temporal Knowledge Graph RAG API",
-            "version": Config.API_VERSION,
-            "description": "Schema-less temporal knowledge graph with bi-temporal model",
-            "endpoints": {
-                "health": "/health",
-                "ingest": "/ingest",
-                "search": "/search",
-                "episodes": "/episodes",
-                "entities": "/entities",
-                "stats": "/stats",
-                "build_communities": "/build-communities",
-                "communities": "/communities"
-            }
-        }
+        return Response(content=ROOT_RESPONSE, media_type="application/json")
     
     @app.get("/health")
     async def health_check():
         """Health check endpoint"""
-        return {
+        return ORJSONResponse({
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
-            "graphiti": "connected" if graphiti_instance else "disconnected"
-        }
+            "graphiti": _graphiti_status
+        })
     
     @app.post("/ingest", status_code=201)
     async def ingest_data(ingestion: DataIngestion):
@@ -89,162 +484,111 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=503, detail="Service not initialized")
 
         try:
-            # Parse reference time if provided
-            ref_time = None
-            if ingestion.reference_time:
-                ref_time = datetime.fromisoformat(ingestion.reference_time.replace('Z', '+00:00'))
-
-            # Build context with tenant and customer information
-            context_parts = []
-            if ingestion.context:
-                context_parts.append(ingestion.context)
-
-            # Add tenant context if provided
-            if ingestion.tenant_context:
-                tc = ingestion.tenant_context
-                context_parts.append(f"Tenant ID: {tc.tenant_id}")
-                if tc.tenant_name:
-                    context_parts.append(f"Tenant Name: {tc.tenant_name}")
-                if tc.tenant_address:
-                    context_parts.append(f"Tenant Address: {tc.tenant_address}")
-
-            # Add customer context if provided
-            if ingestion.customer_context:
-                cc = ingestion.customer_context
-                if cc.customer_id:
-                    context_parts.append(f"Customer ID: {cc.customer_id}")
-                if cc.customer_name:
-                    context_parts.append(f"Customer: {cc.customer_name}")
-                if cc.customer_address:
-                    context_parts.append(f"Customer Address: {cc.customer_address}")
-
-            full_context = ". ".join(context_parts) if context_parts else None
-
-            # Determine group_ids for tenant isolation
-            # Priority: tenant_context.tenant_id > tenant_id field
-            group_ids = []
-            if ingestion.tenant_context:
-                group_ids.append(ingestion.tenant_context.tenant_id)
-            elif ingestion.tenant_id:
-                group_ids.append(ingestion.tenant_id)
-
-            # Ingest data with tenant context
-            result = await ingestion_service.ingest_data(
-                data=ingestion.data,
-                reference_time=ref_time,
-                context=full_context,
-                group_ids=group_ids if group_ids else None
-            )
+            group_ids = _resolve_group_ids(ingestion)
+
+            # Ingest data with tenant context; embedding calls made during
+            # extraction are coalesced into batch requests
+            async with batching_scope():
+                result = await ingestion_service.ingest_data(
+                    data=ingestion.data,
+                    reference_time=_parse_reference_time(ingestion.reference_time),
+                    context=_build_context(ingestion),
+                    group_ids=group_ids
+                )
+            _invalidate_search_cache(group_ids)
 
             return result
             
         except Exception as e:
-            error_msg = str(e)
-            
-            # Handle rate limit errors
-            if any(x in error_msg.lower() for x in ['rate limit', 'quota', 'too many requests']):
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "error": "Rate Limit Exceeded",
-                        "message": error_msg,
-                        "suggestion": "Please wait a moment and try again. If you continue to see rate limit errors, reduce request frequency or batch size, or review your OpenAI rate limits.",
-                        "original_error": error_msg
-                    }
-                )
-            
-            # Handle authentication errors
-            if any(x in error_msg.lower() for x in ['authentication', 'api key', 'unauthorized']):
-                return JSONResponse(
-                    status_code=401,
-                    content={
-                        "error": "Authentication Error",
-                        "message": "Invalid or missing OpenAI API key",
-                        "suggestion": "Check your OPENAI_API_KEY in the .env file or environment variables.",
-                        "original_error": error_msg
-                    }
-                )
-            
-            # Handle timeout errors
-            if any(x in error_msg.lower() for x in ['timeout', 'timed out']):
-                return JSONResponse(
-                    status_code=504,
-                    content={
-                        "error": "Timeout Error",
-                        "message": "Request timed out",
-                        "suggestion": "Try with smaller data or retry later",
-                        "original_error": error_msg
-                    }
-                )
-            
-            # Generic error
-            raise HTTPException(status_code=500, detail=f"Ingestion failed: {error_msg}")
+            return _ingestion_error_response(e)
+
+    @app.post("/ingest/batch", status_code=201)
+    async def ingest_batch(batch: BatchIngestion):
+        """Batch ingestion - items are grouped by tenant and extracted in one bulk call per tenant
+
+        Bulk extraction skips temporal edge invalidation and date extraction: facts
+        contradicted by the new episodes keep no invalid_at. Send `bulk: false` (or
+        use /ingest) for events that supersede earlier ones; the items then go
+        through the per-episode pipeline, each tenant's items in order.
+
+        Tenant groups are written one after another, so a failure in one group does
+        not undo the groups already written. Unless every group failed, the response
+        is a 201 with status "partial" and error entries for the failed group's items,
+        so clients re-submit only those items instead of retrying the whole batch.
+        """
+        if not ingestion_service:
+            raise HTTPException(status_code=503, detail="Service not initialized")
+
+        try:
+            if not batch.bulk:
+                return await _ingest_batch_per_episode(batch)
+
+            # Group items by tenant so each bulk call stays tenant-isolated
+            groups = {}
+            for index, ingestion in enumerate(batch.items):
+                group_ids = _resolve_group_ids(ingestion)
+                key = group_ids[0] if group_ids else None
+                groups.setdefault(key, []).append((index, {
+                    "data": ingestion.data,
+                    "reference_time": _parse_reference_time(ingestion.reference_time),
+                    "context": _build_context(ingestion),
+                }))
+
+            results = [None] * len(batch.items)
+            errors = []
+            for group_id, entries in groups.items():
+                group_ids = [group_id] if group_id else None
+                try:
+                    async with batching_scope():
+                        group_results = await ingestion_service.ingest_bulk(
+                            items=[item for _, item in entries],
+                            group_ids=group_ids
+                        )
+                except Exception as e:
+                    logger.warning("⚠️  Batch ingestion for group %s failed: %s", group_id, e)
+                    errors.append(e)
+                    group_results = [{"status": "error", "group_id": group_id, "error": str(e)}] * len(entries)
+                for (index, _), result in zip(entries, group_results):
+                    results[index] = result
+                # A failed bulk call may still have written some episodes
+                _invalidate_search_cache(group_ids)
+
+            if len(errors) == len(groups):
+                # No group succeeded, so the request fails as a whole and can be retried
+                return _ingestion_error_response(errors[0])
+
+            return {
+                "status": "partial" if errors else "success",
+                "count": len(results),
+                "results": results
+            }
+
+        except Exception as e:
+            return _ingestion_error_response(e)
     
     @app.post("/search")
-    async def search(query: SearchQuery):
+    async def search(query: SearchQuery, request: Request):
         """Semantic search with LLM query enhancement and entity-based filtering.
 
         Note: Tenant context is optional here to support single-tenant/demo usage
         and to align with the test suite. When tenant information is provided,
         it is translated into group_ids for isolation; otherwise the search is
         performed over all data.
+
+        Clients sending `Accept: application/x-ndjson` receive the response as
+        newline-delimited JSON (envelope line first, then one line per result),
+        so they can stop reading after the results they need.
         """
         if not search_service:
             raise HTTPException(status_code=503, detail="Service not initialized")
 
         try:
-            # Determine group_ids for tenant isolation (optional)
-            # Priority: explicit group_ids > tenant_context.tenant_id > tenant_id field
-            group_ids = query.group_ids
-            if not group_ids:
-                if query.tenant_context:
-                    group_ids = [query.tenant_context.tenant_id]
-                    print(f"🏢 Tenant isolation: Filtering by tenant_id={query.tenant_context.tenant_id}")
-                elif query.tenant_id:
-                    group_ids = [query.tenant_id]
-                    print(f"🏢 Tenant isolation: Filtering by tenant_id={query.tenant_id}")
-
-            # Enhance query with customer and tenant context if provided
-            enhanced_query = query.query
-            context_hints = []
-
-            # Add customer context hints
-            if query.customer_context and query.customer_context.customer_name:
-                context_hints.append(query.customer_context.customer_name)
-
-            # Add tenant context hints
-            if query.tenant_context and query.tenant_context.tenant_name:
-                context_hints.append(query.tenant_context.tenant_name)
-
-            # Add context hints to query for better entity matching
-            if context_hints and query.enhance_query:
-                enhanced_query = f"{query.query} {' '.join(context_hints)}"
-                print(f"🔍 Enhanced query with context: {enhanced_query}")
-
-            search_result = await search_service.search(
-                query=enhanced_query,
-                num_results=query.num_results,
-                group_ids=group_ids,
-                min_score=query.min_score,
-                use_entity_filter=query.use_entity_filter,
-                enhance_query=query.enhance_query
-            )
+            response = await _search_impl(query)
 
-            # Extract transformation metadata and results
-            transformation = search_result.get("transformation", {})
-            results = search_result.get("results", [])
+            if "application/x-ndjson" in request.headers.get("accept", ""):
+                return StreamingResponse(_ndjson_iter(response), media_type="application/x-ndjson")
 
-            return {
-                "query": query.query,
-                "num_results": len(results),
-                "min_score": query.min_score,
-                "tenant_id": query.tenant_id,
-                "tenant_context": query.tenant_context.dict() if query.tenant_context else None,
-                "customer_context": query.customer_context.dict() if query.customer_context else None,
-                "group_ids": group_ids,
-                "transformation": transformation,
-                "results": results
-            }
+            return response
 
         except HTTPException:
             # Preserve explicit HTTP errors
@@ -253,17 +597,37 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
     @app.get("/stats")
-    async def get_statistics():
+    async def get_statistics(request: Request):
         """Get graph statistics"""
         if not search_service:
             raise HTTPException(status_code=503, detail="Service not initialized")
 
         try:
-            stats = await search_service.get_statistics()
-            return stats
+            stats = _stats_cache.get("stats")
+            if stats is None:
+                stats = await search_service.get_statistics()
+                _stats_cache.set("stats", stats)
+            return _etag_response(request, stats)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
 
+    @app.post("/admin/cache/warm")
+    async def warm_cache(
+        tenant_id: Optional[List[str]] = Query(default=None, description="Tenants to warm (defaults to WARMUP_TENANTS)")
+    ):
+        """Re-run the warm-up queries to repopulate the search cache"""
+        if not search_service:
+            raise HTTPException(status_code=503, detail="Service not initialized")
+
+        tenant_ids = tenant_id or Config.WARMUP_TENANTS
+        warmed = await _warm_search_cache(tenant_ids)
+
+        return {
+            "status": "success",
+            "tenants": tenant_ids,
+            "queries_warmed": warmed
+        }
+
     @app.get("/entities/{entity_uuid}")
     async def get_entity(entity_uuid: str):
         """Get entity by UUID with relationships"""
@@ -305,27 +669,7 @@ def create_app() -> FastAPI:
             LIMIT $limit
             """
 
-            async with graphiti_instance.driver.session() as session:
-                result = await session.run(query, offset=offset, limit=limit)
-                entities = await result.data()
-
-            # Normalize temporal fields to ISO strings if they are temporal objects
-            normalized_entities = []
-            for ent in entities:
-                normalized_entities.append({
-                    "uuid": ent.get("uuid"),
-                    "name": ent.get("name"),
-                    "created_at": ent.get("created_at").isoformat() if hasattr(ent.get("created_at"), "isoformat") and ent.get("created_at") else ent.get("created_at"),
-                    "valid_at": ent.get("valid_at").isoformat() if hasattr(ent.get("valid_at"), "isoformat") and ent.get("valid_at") else ent.get("valid_at"),
-                    "expired_at": ent.get("expired_at").isoformat() if hasattr(ent.get("expired_at"), "isoformat") and ent.get("expired_at") else ent.get("expired_at"),
-                })
-
-            return {
-                "total": len(normalized_entities),
-                "offset": offset,
-                "limit": limit,
-                "entities": normalized_entities,
-            }
+            return await _stream_page(query, "entities", offset, limit)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to list entities: {str(e)}")
 
@@ -339,26 +683,17 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=503, detail="Service not initialized")
 
         try:
-            query = f"""
+            query = """
             MATCH (e:Episodic)
             RETURN e.uuid AS uuid, e.name AS name, e.content AS content,
                    e.created_at AS created_at, e.valid_at AS valid_at,
                    e.source AS source
             ORDER BY e.created_at DESC
-            SKIP {offset}
-            LIMIT {limit}
+            SKIP $offset
+            LIMIT $limit
             """
 
-            async with graphiti_instance.driver.session() as session:
-                result = await session.run(query)
-                episodes = await result.data()
-
-            return {
-                "total": len(episodes),
-                "offset": offset,
-                "limit": limit,
-                "episodes": episodes
-            }
+            return await _stream_page(query, "episodes", offset, limit)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to list episodes: {str(e)}")
 
@@ -369,15 +704,18 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=503, detail="Service not initialized")
 
         try:
-            print("🔍 Building communities...")
-            await graphiti_instance.build_communities()
-
-            # Count communities
-            query = "MATCH (c:Community) RETURN count(c) as count"
-            async with graphiti_instance.driver.session() as session:
-                result = await session.run(query)
-                record = await result.single()
-                community_count = record['count'] if record else 0
+            logger.info("🔍 Building communities...")
+            built = await graphiti_instance.build_communities()
+
+            # build_communities() replaces every community and returns the new nodes
+            if isinstance(built, tuple):
+                community_nodes, _ = built
+                community_count = len(community_nodes)
+            else:
+                # Older graphiti-core versions return nothing; a bare label count is
+                # answered from Neo4j's count store without scanning nodes
+                records = await run_read(graphiti_instance, "MATCH (c:Community) RETURN count(c) as count")
+                community_count = records[0]['count'] if records else 0
 
             return {
                 "status": "success",
@@ -389,6 +727,7 @@ def create_app() -> FastAPI:
 
     @app.get("/communities")
     async def list_communities(
+        request: Request,
         limit: int = Query(default=20, ge=1, le=100)
     ):
         """List all communities"""
@@ -396,21 +735,19 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=503, detail="Service not initialized")
 
         try:
-            query = f"""
+            query = """
             MATCH (c:Community)
             RETURN c.name AS name, c.summary AS summary, c.size AS size
             ORDER BY c.size DESC
-            LIMIT {limit}
+            LIMIT $limit
             """
 
-            async with graphiti_instance.driver.session() as session:
-                result = await session.run(query)
-                communities = await result.data()
+            communities = await run_read(graphiti_instance, query, limit=limit)
 
-            return {
+            return _etag_response(request, {
                 "total": len(communities),
                 "communities": communities
-            }
+            })
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to list communities: {str(e)}")
 
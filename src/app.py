@@ -5,5 +5,6 @@ app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # "auto" uses uvloop when it is installed (it is skipped on Windows) and asyncio otherwise
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto", http="httptools")
 
@@ -1,7 +1,9 @@
 """Core functionality for Temporal Knowledge Graph RAG"""
 from .clients import get_llm_client, get_embedder, get_cross_encoder, get_all_clients
-from .database import get_graphiti_instance, close_graphiti_instance, build_indices
+from .database import get_graphiti_instance, close_graphiti_instance, build_indices, run_read, shared_session
 from .config import Config
+from .log import setup_logging
+from .cached_clients import BatchingEmbedder, CachedEmbedder, CachingOpenAIClient, batching_scope
 
 __all__ = [
     "get_llm_client",
@@ -11,5 +13,12 @@ __all__ = [
     "get_graphiti_instance",
     "close_graphiti_instance",
     "build_indices",
+    "run_read",
+    "shared_session",
     "Config",
+    "setup_logging",
+    "CachedEmbedder",
+    "CachingOpenAIClient",
+    "BatchingEmbedder",
+    "batching_scope",
 ]
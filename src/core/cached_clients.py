@@ -0,0 +1,299 @@
+"""Caching wrappers around the Graphiti OpenAI clients"""
+import asyncio
+import copy
+import hashlib
+import logging
+import time
+from array import array
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from graphiti_core.embedder.client import EmbedderClient
+from graphiti_core.llm_client.openai_client import OpenAIClient
+
+from .config import Config
+from .log import LOGGER_NAME
+from src.utils import TTLCache
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+def _single_text(input_data) -> Optional[str]:
+    """The text of a single-string embedding request (Graphiti passes [text]), else None"""
+    if isinstance(input_data, str):
+        return input_data
+    if isinstance(input_data, list) and len(input_data) == 1 and isinstance(input_data[0], str):
+        return input_data[0]
+    return None
+
+
+class _EmbeddingBatch:
+    """Single-text embedding requests collected within one batching_scope()"""
+
+    # OpenAI accepts up to 2048 inputs per embeddings call
+    MAX_INPUTS = 2048
+
+    def __init__(self, window: float):
+        self.window = window
+        self.pending = []  # (base embedder, text, future)
+        self._timer = None
+        self._tasks = set()
+
+    def add(self, base: EmbedderClient, text: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((base, text, future))
+
+        if len(self.pending) >= self.MAX_INPUTS:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._schedule_flush)
+        return future
+
+    def _schedule_flush(self) -> None:
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        """Send every pending text in as few create_batch() calls as possible"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self.pending = self.pending, []
+
+        by_base = {}
+        for base, text, future in pending:
+            by_base.setdefault(base, []).append((text, future))
+
+        for base, entries in by_base.items():
+            unique_texts = list(dict.fromkeys(text for text, _ in entries))
+            try:
+                embeddings = {}
+                for start in range(0, len(unique_texts), self.MAX_INPUTS):
+                    chunk = unique_texts[start:start + self.MAX_INPUTS]
+                    embeddings.update(zip(chunk, await base.create_batch(chunk)))
+            except Exception as e:
+                for _, future in entries:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for text, future in entries:
+                if not future.done():
+                    future.set_result(embeddings[text])
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+_current_batch: ContextVar[Optional[_EmbeddingBatch]] = ContextVar("embedding_batch", default=None)
+
+
+@asynccontextmanager
+async def batching_scope(window_ms: int = None):
+    """
+    Coalesce single-text embedding calls made by a BatchingEmbedder within this block
+
+    Calls wait up to window_ms (EMBEDDING_BATCH_WINDOW_MS) for others to join and are
+    then sent as one create_batch() request. Tasks spawned inside the block inherit
+    the scope through the copied context.
+    """
+    window = (window_ms if window_ms is not None else Config.EMBEDDING_BATCH_WINDOW_MS) / 1000
+    batch = _EmbeddingBatch(window)
+    token = _current_batch.set(batch)
+    try:
+        yield batch
+    finally:
+        _current_batch.reset(token)
+        await batch.close()
+
+
+class BatchingEmbedder(EmbedderClient):
+    """Embedder that joins the enclosing batching_scope(), or calls base directly outside one"""
+
+    def __init__(self, base: EmbedderClient):
+        self.base = base
+
+    async def create(self, input_data) -> List[float]:
+        batch = _current_batch.get()
+        text = _single_text(input_data)
+        if batch is None or text is None:
+            return await self.base.create(input_data)
+        return await batch.add(self.base, text)
+
+    async def create_batch(self, input_data_list: List[str]) -> List[List[float]]:
+        return await self.base.create_batch(input_data_list)
+
+
+class CachedEmbedder(EmbedderClient):
+    """
+    Embedder that serves repeated strings from an in-process cache
+
+    Ingestion and search embed the same entity names, facts and queries over and
+    over; identical strings are keyed by a blake2b digest and their vectors kept
+    as packed fp32 bytes (~6 KB per 1536-dim vector instead of ~50 KB of floats).
+    Misses return the same fp32-rounded vector that later hits will, so a text's
+    embedding does not depend on the cache state.
+    Anything other than a single string (e.g. pre-tokenized input) bypasses the cache.
+    """
+
+    def __init__(self, base: EmbedderClient, maxsize: int = None, ttl: float = None):
+        self.base = base
+        self.cache = TTLCache(
+            maxsize=maxsize or Config.EMBEDDING_CACHE_SIZE,
+            ttl=ttl or Config.EMBEDDING_CACHE_TTL,
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _lookup(self, text: str):
+        packed = self.cache.get(self._key(text))
+        if packed is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        vector = array("f")
+        vector.frombytes(packed)
+        return vector.tolist()
+
+    def _store(self, text: str, embedding: List[float]) -> List[float]:
+        """Cache the fp32 packing of embedding and return it as floats"""
+        vector = array("f", embedding)
+        self.cache.set(self._key(text), vector.tobytes())
+        return vector.tolist()
+
+    async def create(self, input_data) -> List[float]:
+        text = _single_text(input_data)
+        if text is None:
+            return await self.base.create(input_data)
+
+        cached = self._lookup(text)
+        if cached is not None:
+            return cached
+
+        return self._store(text, await self.base.create(input_data))
+
+    async def create_batch(self, input_data_list: List[str]) -> List[List[float]]:
+        results = [self._lookup(text) for text in input_data_list]
+        missing = [i for i, vector in enumerate(results) if vector is None]
+
+        if missing:
+            # Embed each distinct uncached string once
+            unique_texts = list(dict.fromkeys(input_data_list[i] for i in missing))
+            embeddings = {
+                text: self._store(text, embedding)
+                for text, embedding in zip(unique_texts, await self.base.create_batch(unique_texts))
+            }
+            for i in missing:
+                results[i] = embeddings[input_data_list[i]]
+
+        return results
+
+
+def _message_parts(message) -> tuple:
+    """(role, content) for a Graphiti Message or a plain chat dict"""
+    if isinstance(message, dict):
+        return message.get("role", ""), message.get("content", "")
+    return message.role, message.content
+
+
+class CachingOpenAIClient(OpenAIClient):
+    """
+    OpenAIClient that reuses responses for repeated prompts
+
+    Responses are cached under a blake2b digest of the model settings, the
+    response model, the call options and every message. When the semantic layer
+    is enabled (SEMANTIC_CACHE_ENABLED), a miss on the exact key embeds the
+    non-system messages and returns the stored response of the most similar prior
+    prompt that shares the same system prompt and settings, if its cosine
+    similarity reaches SEMANTIC_CACHE_THRESHOLD.
+    """
+
+    # Prompt characters embedded for the semantic lookup
+    SEMANTIC_MAX_CHARS = 8000
+
+    def __init__(self, *args, embedder: Optional[EmbedderClient] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.response_cache = TTLCache(maxsize=Config.LLM_CACHE_SIZE, ttl=Config.LLM_CACHE_TTL)
+        self.embedder = embedder if Config.SEMANTIC_CACHE_ENABLED else None
+        # namespace -> list of (expires_at, unit vector, exact key)
+        self._semantic_index: Dict[bytes, list] = {}
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _namespace(self, messages, response_model, args, kwargs) -> bytes:
+        """Digest of everything except the non-system message content"""
+        schema = f"{response_model.__module__}.{response_model.__qualname__}" if response_model else ""
+        system = [content for role, content in map(_message_parts, messages) if role == "system"]
+        material = repr((self.model, self.small_model, self.temperature, schema, args, sorted(kwargs.items()), system))
+        return hashlib.blake2b(material.encode("utf-8"), digest_size=16).digest()
+
+    @staticmethod
+    def _exact_key(namespace: bytes, messages) -> bytes:
+        digest = hashlib.blake2b(namespace, digest_size=16)
+        for role, content in map(_message_parts, messages):
+            digest.update(f"{role}\x00{content}\x01".encode("utf-8"))
+        return digest.digest()
+
+    async def _embed_prompt(self, messages) -> Optional[np.ndarray]:
+        text = "\n".join(content for role, content in map(_message_parts, messages) if role != "system")
+        try:
+            vector = np.asarray(await self.embedder.create(text[:self.SEMANTIC_MAX_CHARS]), dtype=np.float32)
+        except Exception as e:
+            logger.warning("⚠️  Semantic cache embedding failed, skipping lookup: %s", e)
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _semantic_lookup(self, namespace: bytes, vector: np.ndarray) -> Optional[Any]:
+        now = time.monotonic()
+        entries = [entry for entry in self._semantic_index.get(namespace, []) if entry[0] >= now]
+        self._semantic_index[namespace] = entries
+        if not entries:
+            return None
+
+        scores = np.stack([entry[1] for entry in entries]) @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < Config.SEMANTIC_CACHE_THRESHOLD:
+            return None
+        return self.response_cache.get(entries[best][2])
+
+    def _semantic_store(self, namespace: bytes, vector: np.ndarray, key: bytes) -> None:
+        entries = self._semantic_index.setdefault(namespace, [])
+        entries.append((time.monotonic() + Config.SEMANTIC_CACHE_TTL, vector, key))
+        if len(entries) > Config.LLM_CACHE_SIZE:
+            del entries[0]
+
+    async def generate_response(self, messages, response_model=None, *args, **kwargs) -> Dict[str, Any]:
+        namespace = self._namespace(messages, response_model, args, kwargs)
+        key = self._exact_key(namespace, messages)
+
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return copy.deepcopy(cached)
+
+        vector = await self._embed_prompt(messages) if self.embedder else None
+        if vector is not None:
+            cached = self._semantic_lookup(namespace, vector)
+            if cached is not None:
+                self.semantic_hits += 1
+                return copy.deepcopy(cached)
+
+        self.misses += 1
+        # generate_response mutates the messages it is given, so the key is computed first
+        response = await super().generate_response(messages, response_model, *args, **kwargs)
+        self.response_cache.set(key, copy.deepcopy(response))
+        if vector is not None:
+            self._semantic_store(namespace, vector, key)
+        return response
@@ -1,14 +1,19 @@
 """Client initialization for LLM, embeddings, and cross-encoder (OpenAI-only)"""
+import logging
+
 from graphiti_core.llm_client.config import LLMConfig
-from graphiti_core.llm_client.openai_client import OpenAIClient
 from graphiti_core.embedder.openai import OpenAIEmbedder, OpenAIEmbedderConfig
 from graphiti_core.cross_encoder.openai_reranker_client import OpenAIRerankerClient
 
 from .config import Config
+from .cached_clients import BatchingEmbedder, CachedEmbedder, CachingOpenAIClient
+from .log import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
 
 
 def get_llm_client():
-    """Get OpenAI LLM client"""
+    """Get OpenAI LLM client with response caching"""
     Config.validate()
 
     llm_config = LLMConfig(
@@ -16,7 +21,8 @@ def get_llm_client():
         model=Config.OPENAI_LLM_MODEL,
         small_model=Config.OPENAI_LLM_MODEL,
     )
-    return OpenAIClient(config=llm_config)
+    embedder = get_embedder() if Config.SEMANTIC_CACHE_ENABLED else None
+    return CachingOpenAIClient(config=llm_config, embedder=embedder)
 
 
 def get_embedder():
@@ -24,15 +30,20 @@ def get_embedder():
     Get OpenAI embedder client
     
     Returns:
-        OpenAIEmbedder: Configured OpenAI embedder
+        CachedEmbedder: Configured OpenAI embedder behind an in-process embedding cache;
+        cache misses inside a batching_scope() are coalesced into one batch call
     """
     Config.validate()
     
-    return OpenAIEmbedder(
-        config=OpenAIEmbedderConfig(
-            api_key=Config.OPENAI_API_KEY,
-            embedding_model=Config.OPENAI_EMBEDDING_MODEL,
-            embedding_dim=Config.OPENAI_EMBEDDING_DIM,
+    return CachedEmbedder(
+        BatchingEmbedder(
+            OpenAIEmbedder(
+                config=OpenAIEmbedderConfig(
+                    api_key=Config.OPENAI_API_KEY,
+                    embedding_model=Config.OPENAI_EMBEDDING_MODEL,
+                    embedding_dim=Config.OPENAI_EMBEDDING_DIM,
+                )
+            )
         )
     )
 
@@ -54,15 +65,14 @@ def get_cross_encoder():
 
 def get_all_clients():
     """Get all clients (LLM, embedder, cross-encoder)"""
-    print("🤖 Configuring OpenAI clients")
-    print(f"  - LLM Model: {Config.OPENAI_LLM_MODEL} (OpenAI)")
-    print(f"  - Embedding Model: {Config.OPENAI_EMBEDDING_MODEL} (OpenAI)")
+    logger.info("🤖 Configuring OpenAI clients")
+    logger.info("  - LLM Model: %s (OpenAI)", Config.OPENAI_LLM_MODEL)
+    logger.info("  - Embedding Model: %s (OpenAI)", Config.OPENAI_EMBEDDING_MODEL)
 
     if Config.ENABLE_RATE_LIMIT_DELAY:
-        print(f"  - Rate Limiting: Enabled ({Config.RATE_LIMIT_DELAY_MS}ms delay)")
+        logger.info("  - Rate Limiting: Enabled (%sms delay)", Config.RATE_LIMIT_DELAY_MS)
     else:
-        print(f"  - Rate Limiting: Disabled")
-    print()
+        logger.info("  - Rate Limiting: Disabled")
 
     return (
         get_llm_client(),
@@ -1,92 +1,118 @@
 """Configuration management for Temporal Knowledge Graph RAG System"""
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
-class Config:
-    """Centralized configuration management"""
+@dataclass(frozen=True, slots=True)
+class _Settings:
+    """Centralized configuration management (read from the environment once, at import)"""
     
     # Base paths
-    BASE_DIR = Path(__file__).parent.parent.parent
-    DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data"))
-    CACHE_DIR = Path(os.getenv("CACHE_DIR", BASE_DIR / "cache"))
+    BASE_DIR: Path = Path(__file__).parent.parent.parent
+    DATA_DIR: Path = Path(os.getenv("DATA_DIR", BASE_DIR / "data"))
+    CACHE_DIR: Path = Path(os.getenv("CACHE_DIR", BASE_DIR / "cache"))
 
     # OpenAI Configuration (LLM + Embeddings)
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-    OPENAI_LLM_MODEL = os.getenv("OPENAI_LLM_MODEL", "gpt-4o-mini")
-    OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
-    OPENAI_EMBEDDING_DIM = int(os.getenv("OPENAI_EMBEDDING_DIM", "1536"))
+    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_LLM_MODEL: str = os.getenv("OPENAI_LLM_MODEL", "gpt-4o-mini")
+    OPENAI_EMBEDDING_MODEL: str = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+    OPENAI_EMBEDDING_DIM: int = int(os.getenv("OPENAI_EMBEDDING_DIM", "1536"))
     
     # Neo4j Configuration
-    NEO4J_URI = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
-    NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-    NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "graph_rag")
+    NEO4J_URI: str = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
+    NEO4J_USER: str = os.getenv("NEO4J_USER", "neo4j")
+    NEO4J_PASSWORD: str = os.getenv("NEO4J_PASSWORD", "graph_rag")
+    NEO4J_POOL_SIZE: int = int(os.getenv("NEO4J_POOL_SIZE", "100"))
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT: float = float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "60"))
+    NEO4J_MAX_CONCURRENCY: int = int(os.getenv("NEO4J_MAX_CONCURRENCY", os.getenv("NEO4J_POOL_SIZE", "100")))
     
     # Application Settings
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    API_VERSION = "1.0.0"
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    API_VERSION: str = "1.0.0"
 
     # Rate Limiting Configuration
-    ENABLE_RATE_LIMIT_DELAY = os.getenv("ENABLE_RATE_LIMIT_DELAY", "false").lower() == "true"
-    RATE_LIMIT_DELAY_MS = int(os.getenv("RATE_LIMIT_DELAY_MS", "2000"))
-    RATE_LIMIT_ITERATION_DELAY_MS = int(os.getenv("RATE_LIMIT_ITERATION_DELAY_MS", "3000"))
+    ENABLE_RATE_LIMIT_DELAY: bool = os.getenv("ENABLE_RATE_LIMIT_DELAY", "false").lower() == "true"
+    RATE_LIMIT_DELAY_MS: int = int(os.getenv("RATE_LIMIT_DELAY_MS", "2000"))
+    RATE_LIMIT_ITERATION_DELAY_MS: int = int(os.getenv("RATE_LIMIT_ITERATION_DELAY_MS", "3000"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    INGEST_CONCURRENCY: int = int(os.getenv("INGEST_CONCURRENCY", "8"))
+
+    # Cache Configuration
+    SEARCH_CACHE_SIZE: int = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+    SEARCH_CACHE_TTL: int = int(os.getenv("SEARCH_CACHE_TTL", "600"))
+    ONE_HOP_CACHE_SIZE: int = int(os.getenv("ONE_HOP_CACHE_SIZE", "100000"))
+    ONE_HOP_CACHE_TTL: int = int(os.getenv("ONE_HOP_CACHE_TTL", "600"))
+    ENHANCEMENT_CACHE_SIZE: int = int(os.getenv("ENHANCEMENT_CACHE_SIZE", "2048"))
+    ENHANCEMENT_CACHE_TTL: int = int(os.getenv("ENHANCEMENT_CACHE_TTL", "86400"))
+    IDEMPOTENCY_CACHE_SIZE: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "100000"))
+    IDEMPOTENCY_CACHE_TTL: int = int(os.getenv("IDEMPOTENCY_CACHE_TTL", "3600"))
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))
+    EMBEDDING_CACHE_TTL: int = int(os.getenv("EMBEDDING_CACHE_TTL", "86400"))
+    EMBEDDING_BATCH_WINDOW_MS: int = int(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "20"))
+    LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", "10000"))
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", "86400"))
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    SEMANTIC_CACHE_TTL: int = int(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+    STATS_CACHE_TTL: int = int(os.getenv("STATS_CACHE_TTL", "5"))
+    # Comma-separated tenant IDs whose demo queries are pre-run at startup
+    WARMUP_TENANTS: tuple = tuple(t.strip() for t in os.getenv("WARMUP_TENANTS", "").split(",") if t.strip())
 
     # Display settings
-    BANNER_WIDTH = 80
-    SEPARATOR_CHAR = "="
+    BANNER_WIDTH: int = 80
+    SEPARATOR_CHAR: str = "="
     
-    @classmethod
-    def ensure_directories(cls):
+    def ensure_directories(self):
         """Create necessary directories"""
-        for directory in [cls.DATA_DIR, cls.CACHE_DIR]:
+        for directory in [self.DATA_DIR, self.CACHE_DIR]:
             directory.mkdir(parents=True, exist_ok=True)
     
-    @classmethod
-    def validate(cls):
+    def validate(self):
         """Validate required configuration (OpenAI-only)"""
-        if not cls.OPENAI_API_KEY:
+        if not self.OPENAI_API_KEY:
             raise ValueError(
                 "OPENAI_API_KEY must be set.\n"
                 "Get your API key from: https://platform.openai.com/api-keys"
             )
     
-    @classmethod
-    def get_summary(cls) -> dict:
+    def get_summary(self) -> dict:
         """Get configuration summary"""
         summary = {
             "llm_provider": "openai",
-            "embedding_model": cls.OPENAI_EMBEDDING_MODEL,
-            "embedding_dim": cls.OPENAI_EMBEDDING_DIM,
-            "neo4j_uri": cls.NEO4J_URI,
-            "data_dir": str(cls.DATA_DIR),
-            "log_level": cls.LOG_LEVEL,
-            "api_version": cls.API_VERSION,
-            "rate_limit_enabled": cls.ENABLE_RATE_LIMIT_DELAY,
+            "embedding_model": self.OPENAI_EMBEDDING_MODEL,
+            "embedding_dim": self.OPENAI_EMBEDDING_DIM,
+            "neo4j_uri": self.NEO4J_URI,
+            "data_dir": str(self.DATA_DIR),
+            "log_level": self.LOG_LEVEL,
+            "api_version": self.API_VERSION,
+            "rate_limit_enabled": self.ENABLE_RATE_LIMIT_DELAY,
         }
 
         # Model info (OpenAI-only)
-        summary["llm_model"] = f"{cls.OPENAI_LLM_MODEL} (OpenAI)"
+        summary["llm_model"] = f"{self.OPENAI_LLM_MODEL} (OpenAI)"
 
-        if cls.ENABLE_RATE_LIMIT_DELAY:
-            summary["rate_limit_delay"] = f"{cls.RATE_LIMIT_DELAY_MS}ms"
-            summary["iteration_delay"] = f"{cls.RATE_LIMIT_ITERATION_DELAY_MS}ms"
+        if self.ENABLE_RATE_LIMIT_DELAY:
+            summary["rate_limit_delay"] = f"{self.RATE_LIMIT_DELAY_MS}ms"
+            summary["iteration_delay"] = f"{self.RATE_LIMIT_ITERATION_DELAY_MS}ms"
 
         return summary
     
-    @classmethod
-    def print_config(cls):
+    def print_config(self):
         """Print current configuration"""
-        config = cls.get_summary()
-        print(f"\n{cls.SEPARATOR_CHAR * cls.BANNER_WIDTH}")
+        config = self.get_summary()
+        print(f"\n{self.SEPARATOR_CHAR * self.BANNER_WIDTH}")
         print("TEMPORAL KNOWLEDGE GRAPH RAG CONFIGURATION")
-        print(f"{cls.SEPARATOR_CHAR * cls.BANNER_WIDTH}")
+        print(f"{self.SEPARATOR_CHAR * self.BANNER_WIDTH}")
         for key, value in config.items():
             print(f"  {key}: {value}")
-        print(f"{cls.SEPARATOR_CHAR * cls.BANNER_WIDTH}\n")
+        print(f"{self.SEPARATOR_CHAR * self.BANNER_WIDTH}\n")
+
 
+Config = _Settings()
 
 # Ensure directories exist on import
 Config.ensure_directories()
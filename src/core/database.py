@@ -1,15 +1,54 @@
 """Database connection and management"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+
 from graphiti_core import Graphiti
+from graphiti_core.driver.neo4j_driver import Neo4jDriver
+from neo4j import AsyncGraphDatabase, AsyncSession, RoutingControl
+
 from .config import Config
 from .clients import get_all_clients
+from .log import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
 
 
 _graphiti_instance = None
+_instance_lock = asyncio.Lock()
+_current_session: ContextVar[Optional[AsyncSession]] = ContextVar("neo4j_session", default=None)
+
+
+async def _build_driver() -> Neo4jDriver:
+    """Create the Graphiti Neo4j driver with a pool sized from Config"""
+    driver = Neo4jDriver(
+        uri=Config.NEO4J_URI,
+        user=Config.NEO4J_USER,
+        password=Config.NEO4J_PASSWORD,
+    )
+
+    # Neo4jDriver does not expose pool options, so swap in a tuned AsyncDriver.
+    # The default one has not opened any connections yet.
+    default_client = driver.client
+    driver.client = AsyncGraphDatabase.driver(
+        uri=Config.NEO4J_URI,
+        auth=(Config.NEO4J_USER, Config.NEO4J_PASSWORD),
+        max_connection_pool_size=Config.NEO4J_POOL_SIZE,
+        connection_acquisition_timeout=Config.NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+    )
+    await default_client.close()
 
+    return driver
 
-def get_graphiti_instance(force_new=False):
+
+async def get_graphiti_instance(force_new=False):
     """
     Get or create Graphiti instance (singleton pattern)
+
+    Concurrent first callers share one construction: the instance is checked
+    again under a lock so clients and the driver pool are only built once.
     
     Args:
         force_new: Force creation of new instance
@@ -19,17 +58,19 @@ def get_graphiti_instance(force_new=False):
     """
     global _graphiti_instance
     
-    if _graphiti_instance is None or force_new:
-        llm_client, embedder, cross_encoder = get_all_clients()
-
-        _graphiti_instance = Graphiti(
-            uri=Config.NEO4J_URI,
-            user=Config.NEO4J_USER,
-            password=Config.NEO4J_PASSWORD,
-            llm_client=llm_client,
-            embedder=embedder,
-            cross_encoder=cross_encoder
-        )
+    if _graphiti_instance is not None and not force_new:
+        return _graphiti_instance
+
+    async with _instance_lock:
+        if _graphiti_instance is None or force_new:
+            llm_client, embedder, cross_encoder = get_all_clients()
+
+            _graphiti_instance = Graphiti(
+                graph_driver=await _build_driver(),
+                llm_client=llm_client,
+                embedder=embedder,
+                cross_encoder=cross_encoder
+            )
     
     return _graphiti_instance
 
@@ -38,15 +79,57 @@ async def close_graphiti_instance():
     """Close the Graphiti instance"""
     global _graphiti_instance
     
-    if _graphiti_instance:
-        await _graphiti_instance.close()
-        _graphiti_instance = None
+    async with _instance_lock:
+        if _graphiti_instance:
+            await _graphiti_instance.close()
+            _graphiti_instance = None
+
+
+async def run_read(graphiti, query: str, **params) -> list:
+    """
+    Run a read-only query through the driver's managed transactions
+
+    Uses the pooled driver's execute_query() routed to readers, so no session
+    is opened and torn down per call. Rows are built straight from the record
+    tuples, so values come back as the driver returns them (meant for queries
+    that return scalar properties rather than whole nodes).
+
+    Returns:
+        list: One dict per record
+    """
+    records, _, keys = await graphiti.driver.execute_query(
+        query, params=params, routing_=RoutingControl.READ
+    )
+    return [dict(zip(keys, record)) for record in records]
+
+
+@asynccontextmanager
+async def shared_session(graphiti):
+    """
+    Session shared by every shared_session() block nested inside this one
+
+    The outermost block opens the session and the nested blocks reuse it, so a
+    logical operation such as a search runs all of its Cypher on one session.
+    A session runs one query at a time: consume each result before the next
+    query, and don't share it between concurrent Neo4j calls.
+    """
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+
+    async with graphiti.driver.session() as session:
+        token = _current_session.set(session)
+        try:
+            yield session
+        finally:
+            _current_session.reset(token)
 
 
 async def build_indices():
     """Build Neo4j indices and constraints"""
-    graphiti = get_graphiti_instance()
-    print("🔧 Building indices and constraints...")
+    graphiti = await get_graphiti_instance()
+    logger.info("🔧 Building indices and constraints...")
     await graphiti.build_indices_and_constraints()
-    print("✅ Indices built")
+    logger.info("✅ Indices built")
 
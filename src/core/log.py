@@ -0,0 +1,56 @@
+"""Logging setup for Temporal Knowledge Graph RAG"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from .config import Config
+
+LOGGER_NAME = "tkg_rag"
+
+_listener = None
+_queue_handler = None
+
+
+def setup_logging() -> logging.Logger:
+    """
+    Configure the tkg_rag logger (idempotent)
+
+    Records are appended to an in-memory queue and written to stderr by a
+    background QueueListener thread, so request handlers never block on stream I/O.
+
+    Returns:
+        logging.Logger: The configured tkg_rag logger
+    """
+    global _listener, _queue_handler
+
+    logger = logging.getLogger(LOGGER_NAME)
+    if _listener is not None:
+        return logger
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    _queue_handler = QueueHandler(log_queue)
+    logger.addHandler(_queue_handler)
+    logger.setLevel(Config.LOG_LEVEL.upper())
+    logger.propagate = False
+    return logger
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener, _queue_handler
+
+    if _listener is None:
+        return
+
+    _listener.stop()
+    logging.getLogger(LOGGER_NAME).removeHandler(_queue_handler)
+    _listener = None
+    _queue_handler = None
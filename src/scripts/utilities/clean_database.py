@@ -7,6 +7,33 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+async def _drop_schema_items(session, kind, names):
+    """Drop indexes or constraints in one write transaction, falling back to one by one"""
+    if not names:
+        return
+
+    async def drop_all(tx):
+        for name in names:
+            result = await tx.run(f"DROP {kind} `{name}` IF EXISTS")
+            await result.consume()
+
+    try:
+        await session.execute_write(drop_all)
+        for name in names:
+            print(f"   ✅ Dropped {kind.lower()}: {name}")
+        return
+    except Exception as e:
+        print(f"   ⚠️  Batch drop failed ({e}), dropping individually")
+
+    for name in names:
+        try:
+            result = await session.run(f"DROP {kind} `{name}` IF EXISTS")
+            await result.consume()
+            print(f"   ✅ Dropped {kind.lower()}: {name}")
+        except Exception as e:
+            print(f"   ⚠️  Could not drop {kind.lower()} {name}: {e}")
+
+
 async def clean_database():
     """Clean all data from Neo4j database"""
     print("=" * 80)
@@ -27,33 +54,20 @@ async def clean_database():
         await result.consume()
         print("✅ All nodes and relationships deleted")
         
-        # Drop all indices
-        print("\n🗑️  Dropping all indices...")
-        result = await session.run("SHOW INDEXES")
-        indices = await result.data()
-        
-        for index in indices:
-            index_name = index.get('name')
-            if index_name:
-                try:
-                    await session.run(f"DROP INDEX {index_name} IF EXISTS")
-                    print(f"   ✅ Dropped index: {index_name}")
-                except Exception as e:
-                    print(f"   ⚠️  Could not drop index {index_name}: {e}")
-        
-        # Drop all constraints
+        # Drop constraints first: their backing indexes go with them, and those
+        # indexes cannot be dropped on their own
         print("\n🗑️  Dropping all constraints...")
-        result = await session.run("SHOW CONSTRAINTS")
-        constraints = await result.data()
-        
-        for constraint in constraints:
-            constraint_name = constraint.get('name')
-            if constraint_name:
-                try:
-                    await session.run(f"DROP CONSTRAINT {constraint_name} IF EXISTS")
-                    print(f"   ✅ Dropped constraint: {constraint_name}")
-                except Exception as e:
-                    print(f"   ⚠️  Could not drop constraint {constraint_name}: {e}")
+        result = await session.run("SHOW CONSTRAINTS YIELD name")
+        constraint_names = [record['name'] for record in await result.data() if record.get('name')]
+        await _drop_schema_items(session, "CONSTRAINT", constraint_names)
+
+        print("\n🗑️  Dropping all indices...")
+        result = await session.run("SHOW INDEXES YIELD name, owningConstraint")
+        index_names = [
+            record['name'] for record in await result.data()
+            if record.get('name') and not record.get('owningConstraint')
+        ]
+        await _drop_schema_items(session, "INDEX", index_names)
         
         # Verify database is empty
         print("\n📊 Verifying database is clean...")
@@ -77,5 +91,10 @@ async def clean_database():
 
 
 if __name__ == "__main__":
-    asyncio.run(clean_database())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(clean_database())
+    else:
+        uvloop.run(clean_database())
 
@@ -1,9 +1,54 @@
 """Export service for knowledge graph"""
-import json
+import asyncio
+import logging
+from datetime import datetime
 from typing import Dict, Any, List
 from pathlib import Path
+import orjson
 from graphiti_core import Graphiti
 from src.core.config import Config
+from src.core.database import run_read
+from src.core.log import LOGGER_NAME
+from src.utils import json_default
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# Sample queries written out by export_cypher_queries
+_CYPHER_QUERY_EXPORT = """
+-- Temporal Knowledge Graph - Useful Cypher Queries
+
+-- Get all entities
+MATCH (e:Entity)
+RETURN e.name AS entity, e.summary AS summary, e.created_at AS created
+ORDER BY e.created_at DESC
+LIMIT 20;
+
+-- Get all relationships
+MATCH (e1:Entity)-[r:RELATES_TO]->(e2:Entity)
+RETURN e1.name AS source, r.name AS relationship, e2.name AS target
+ORDER BY r.created_at DESC
+LIMIT 20;
+
+-- Get all episodes
+MATCH (ep:Episodic)
+RETURN ep.name AS episode, ep.created_at AS created, ep.content AS content
+ORDER BY ep.created_at DESC
+LIMIT 20;
+
+-- Find entities with most relationships
+MATCH (e:Entity)-[r]-()
+RETURN e.name AS entity, count(r) AS relationship_count
+ORDER BY relationship_count DESC
+LIMIT 10;
+
+-- Get graph statistics
+MATCH (e:Entity)
+WITH count(e) as entities
+MATCH ()-[r:RELATES_TO]->()
+WITH entities, count(r) as relationships
+MATCH (ep:Episodic)
+RETURN entities, relationships, count(ep) as episodes;
+"""
 
 
 class ExportService:
@@ -12,15 +57,18 @@ class ExportService:
     def __init__(self, graphiti: Graphiti):
         self.graphiti = graphiti
     
-    async def export_to_json(self, output_file: Path = None) -> Dict[str, Any]:
+    async def export_to_json(self, output_file: Path = None, return_dict: bool = True) -> Dict[str, Any]:
         """
         Export entire graph to JSON
         
         Args:
             output_file: Optional output file path
+            return_dict: Build and return the full export in memory. When False
+                (requires output_file), records are streamed straight into the
+                file and only the metadata is returned, keeping memory flat.
             
         Returns:
-            Dict with entities, relationships, and episodes
+            Dict with entities, relationships, and episodes (metadata only when streaming)
         """
         # Get all entities
         entities_query = """
@@ -49,22 +97,25 @@ class ExportService:
         ORDER BY ep.created_at DESC
         """
         
-        async with self.graphiti.driver.session() as session:
-            # Fetch entities
-            result = await session.run(entities_query)
-            entities = await result.data()
-            
-            # Fetch relationships
-            result = await session.run(relationships_query)
-            relationships = await result.data()
-            
-            # Fetch episodes
-            result = await session.run(episodes_query)
-            episodes = await result.data()
+        if not return_dict:
+            if not output_file:
+                raise ValueError("output_file is required when return_dict is False")
+            return await self._stream_to_file(Path(output_file), [
+                ("entities", entities_query),
+                ("relationships", relationships_query),
+                ("episodes", episodes_query),
+            ])
+
+        # The three reads are independent, so run them concurrently on pooled connections
+        entities, relationships, episodes = await asyncio.gather(
+            run_read(self.graphiti, entities_query),
+            run_read(self.graphiti, relationships_query),
+            run_read(self.graphiti, episodes_query),
+        )
         
         export_data = {
             "metadata": {
-                "exported_at": json.dumps(None),  # Will be set below
+                "exported_at": datetime.now().isoformat(),
                 "total_entities": len(entities),
                 "total_relationships": len(relationships),
                 "total_episodes": len(episodes)
@@ -79,14 +130,45 @@ class ExportService:
             output_file = Path(output_file)
             output_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_file, 'w') as f:
-                json.dump(export_data, f, indent=2, default=str)
+            output_file.write_bytes(
+                orjson.dumps(export_data, default=json_default, option=orjson.OPT_INDENT_2)
+            )
             
-            print(f"✅ Exported to {output_file}")
+            logger.info("✅ Exported to %s", output_file)
         
         return export_data
     
-    async def export_cypher_queries(self, output_file: Path = None) -> str:
+    async def _stream_to_file(self, output_file: Path, sections: List[tuple]) -> Dict[str, Any]:
+        """Write each (key, query) section's records into output_file as they arrive"""
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {"exported_at": datetime.now().isoformat()}
+
+        with open(output_file, 'wb') as f:
+            f.write(b"{\n")
+            async with self.graphiti.driver.session() as session:
+                for key, query in sections:
+                    result = await session.run(query)
+                    keys = await result.keys()
+
+                    f.write(b'  "%s": [' % key.encode())
+                    count = 0
+                    async for record in result:
+                        f.write(b",\n    " if count else b"\n    ")
+                        f.write(orjson.dumps(dict(zip(keys, record)), default=json_default))
+                        count += 1
+                    f.write(b"\n  ],\n" if count else b"],\n")
+                    metadata[f"total_{key}"] = count
+
+            # Totals are only known once every section has been written
+            f.write(b'  "metadata": ')
+            f.write(orjson.dumps(metadata))
+            f.write(b"\n}\n")
+
+        logger.info("✅ Exported to %s", output_file)
+        return {"metadata": metadata}
+
+    @staticmethod
+    async def export_cypher_queries(output_file: Path = None) -> str:
         """
         Export useful Cypher queries
         
@@ -96,50 +178,14 @@ class ExportService:
         Returns:
             String with Cypher queries
         """
-        queries = """
--- Temporal Knowledge Graph - Useful Cypher Queries
-
--- Get all entities
-MATCH (e:Entity)
-RETURN e.name AS entity, e.summary AS summary, e.created_at AS created
-ORDER BY e.created_at DESC
-LIMIT 20;
-
--- Get all relationships
-MATCH (e1:Entity)-[r:RELATES_TO]->(e2:Entity)
-RETURN e1.name AS source, r.name AS relationship, e2.name AS target
-ORDER BY r.created_at DESC
-LIMIT 20;
-
--- Get all episodes
-MATCH (ep:Episodic)
-RETURN ep.name AS episode, ep.created_at AS created, ep.content AS content
-ORDER BY ep.created_at DESC
-LIMIT 20;
-
--- Find entities with most relationships
-MATCH (e:Entity)-[r]-()
-RETURN e.name AS entity, count(r) AS relationship_count
-ORDER BY relationship_count DESC
-LIMIT 10;
-
--- Get graph statistics
-MATCH (e:Entity)
-WITH count(e) as entities
-MATCH ()-[r:RELATES_TO]->()
-WITH entities, count(r) as relationships
-MATCH (ep:Episodic)
-RETURN entities, relationships, count(ep) as episodes;
-"""
-        
         if output_file:
             output_file = Path(output_file)
             output_file.parent.mkdir(parents=True, exist_ok=True)
             
             with open(output_file, 'w') as f:
-                f.write(queries)
+                f.write(_CYPHER_QUERY_EXPORT)
             
-            print(f"✅ Exported Cypher queries to {output_file}")
+            logger.info("✅ Exported Cypher queries to %s", output_file)
         
-        return queries
+        return _CYPHER_QUERY_EXPORT
 
@@ -1,32 +1,43 @@
 """Search service for knowledge graph"""
+import asyncio
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
+import logging
 import re
 from graphiti_core import Graphiti
 from graphiti_core.llm_client import LLMClient
+from graphiti_core.prompts.models import Message
+from pydantic import BaseModel, Field
 import json
-
-
-class SearchService:
-    """Service for searching the knowledge graph"""
-
-    def __init__(self, graphiti: Graphiti):
-        self.graphiti = graphiti
-        self.llm_client = graphiti.llm_client
-
-    async def _enhance_query_with_llm(self, natural_query: str) -> str:
-        """
-        Use LLM to enhance natural language query by extracting key entities and concepts
-
-        Converts: "What happened to David Chen?"
-        Into: "David Chen departure left TechVision manager Engineering"
-
-        Args:
-            natural_query: Natural language question from user
-
-        Returns:
-            Enhanced query with entity names and key concepts
-        """
-        prompt = f"""You are a query enhancement assistant for a knowledge graph search system.
+from src.core.config import Config
+from src.core.database import shared_session
+from src.core.log import LOGGER_NAME
+from src.utils import TTLCache
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# Strips punctuation from query tokens
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Common question words, prepositions, and verbs never treated as entity names
+_STOP_WORDS = frozenset({
+    'what', 'where', 'when', 'who', 'how', 'why', 'which',
+    'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'at', 'to', 'for', 'of', 'on', 'with',
+    'his', 'her', 'their', 'my', 'your', 'its',
+    'working', 'work', 'works', 'role', 'job', 'position', 'title',
+    'left', 'departure', 'purchase', 'buy', 'service', 'maintenance'
+})
+
+# Question phrasings that call for semantic search rather than entity lookup
+_QUESTION_PATTERNS = (
+    'what car', 'what vehicle', 'when is', 'where is', 'how much',
+    'do you have', 'can i', 'tell me about'
+)
+
+# Fixed instructions and few-shot examples; kept in the system message so the
+# identical prefix can be served from the provider's prompt cache
+_ENHANCE_SYSTEM_PROMPT = """You are a query enhancement assistant for a knowledge graph search system.
 
 Your task: Convert a natural language question into a keyword-rich query that contains:
 1. Entity names (people, companies, products, locations)
@@ -38,7 +49,7 @@ Rules:
 - Include relevant action words (left, joined, purchased, managed, etc.)
 - Remove question words (what, when, where, who, how, why)
 - Keep it concise (5-15 words)
-- Return ONLY the enhanced query, no explanation
+- Return only the enhanced query in the "enhanced" field, no explanation
 
 Examples:
 Input: "What happened to David Chen?"
@@ -57,218 +68,286 @@ Input: "When is my next service due?"
 Output: service due maintenance schedule appointment next
 
 Input: "What is John Anderson's complete customer journey?"
-Output: John Anderson customer journey lead purchase delivery service
+Output: John Anderson customer journey lead purchase delivery service"""
 
-Now enhance this query:
-Input: {natural_query}
-Output:"""
+_ENHANCE_USER_PROMPT = """Now enhance this query:
+Input: {query}"""
 
-        try:
-            response = await self.llm_client.generate_response([{"role": "user", "content": prompt}])
-            enhanced_query = response.strip()
 
-            # Fallback to original if enhancement failed
-            if not enhanced_query or len(enhanced_query) < 3:
-                return natural_query
+class EnhancedQuery(BaseModel):
+    """Structured response for LLM query enhancement"""
+    enhanced: str = Field(..., description="Keyword-rich search query (5-15 words)")
 
-            return enhanced_query
 
-        except Exception as e:
-            # If LLM fails, return original query
-            print(f"Warning: Query enhancement failed: {e}")
-            return natural_query
+@dataclass(slots=True)
+class QueryClassification:
+    """Strategy decision and entity-name candidates for a search query"""
+    use_entity_filter: bool
+    reason: str
+    entity_names: List[str]
 
-    def _should_use_entity_filter(self, query: str) -> bool:
-        """
-        Auto-detect whether to use entity filter based on query characteristics
 
-        Args:
-            query: Search query text
+class OneHopCache:
+    """
+    Tenant-scoped cache of one-hop edge expansions around name-matched entities
 
-        Returns:
-            True if entity filter should be used, False for semantic search
+    Keys are (scope, names, edge_template) where scope is the sorted tuple of
+    group IDs the expansion was filtered by (None = unscoped) and names is the
+    frozenset of lowercased entity names that were matched.
+    """
+
+    # Entities matched per name lookup
+    MAX_ENTITIES = 10
+    # Edges kept per lookup; covers the largest page SearchQuery allows
+    MAX_EDGES = 20
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def scope_for(group_ids: Optional[List[str]]) -> Optional[tuple]:
+        """Normalize group IDs into a hashable cache scope"""
+        return tuple(sorted(group_ids)) if group_ids else None
+
+    def get(self, scope: Optional[tuple], names: frozenset, template: str) -> Optional[List[Dict[str, Any]]]:
+        return self._cache.get((scope, names, template))
+
+    def set(self, scope: Optional[tuple], names: frozenset, template: str, edges: List[Dict[str, Any]]) -> None:
+        self._cache.set((scope, names, template), edges)
+
+    def invalidate(self, group_ids: Optional[List[str]]) -> int:
         """
-        # Check for proper nouns (capitalized words that aren't at start of sentence)
-        words = query.split()
-        capitalized_count = 0
+        Evict expansions that an ingestion into group_ids may have changed
 
-        for i, word in enumerate(words):
-            clean_word = re.sub(r'[^\w\s]', '', word)
-            if clean_word and len(clean_word) > 1:
-                # Count capitalized words (excluding first word)
-                if i > 0 and clean_word[0].isupper():
-                    capitalized_count += 1
+        Unscoped expansions see every tenant and are always evicted; scoped
+        expansions are evicted when they include one of the group IDs.
+        """
+        groups = set(group_ids or [])
+        return self._cache.evict(
+            lambda key: key[0] is None or not groups.isdisjoint(key[0])
+        )
 
-        # If query has 2+ capitalized words (likely entity names), use entity filter
-        if capitalized_count >= 2:
-            return True
 
-        # Check for common question patterns that need semantic search
-        question_patterns = [
-            'what car', 'what vehicle', 'when is', 'where is', 'how much',
-            'do you have', 'can i', 'tell me about'
-        ]
+class SearchService:
+    """Service for searching the knowledge graph"""
 
-        query_lower = query.lower()
-        for pattern in question_patterns:
-            if pattern in query_lower:
-                return False
+    # Edge template used for one-hop cache keys
+    RELATES_TO_TEMPLATE = "RELATES_TO"
 
-        # Default: use entity filter if query has at least one capitalized word
-        return capitalized_count >= 1
+    def __init__(self, graphiti: Graphiti):
+        self.graphiti = graphiti
+        self.llm_client = graphiti.llm_client
+        self.one_hop_cache = OneHopCache(
+            maxsize=Config.ONE_HOP_CACHE_SIZE,
+            ttl=Config.ONE_HOP_CACHE_TTL
+        )
+        self.enhancement_cache = TTLCache(
+            maxsize=Config.ENHANCEMENT_CACHE_SIZE,
+            ttl=Config.ENHANCEMENT_CACHE_TTL
+        )
+        self._enhancements_in_flight: Dict[str, asyncio.Future] = {}
+        # Bound the external calls a burst of searches can have in flight
+        self._llm_sem = asyncio.Semaphore(Config.LLM_MAX_CONCURRENCY)
+        self._neo4j_sem = asyncio.Semaphore(Config.NEO4J_MAX_CONCURRENCY)
 
-    def _get_strategy_reason(self, query: str, use_entity_filter: bool) -> str:
+    def invalidate_cache(self, group_ids: Optional[List[str]] = None) -> None:
+        """Drop cached graph expansions affected by an ingestion into group_ids"""
+        self.one_hop_cache.invalidate(group_ids)
+
+    async def _enhance_query_with_llm(self, natural_query: str) -> str:
         """
-        Get human-readable explanation for why a strategy was chosen
+        Use LLM to enhance natural language query by extracting key entities and concepts
+
+        Converts: "What happened to David Chen?"
+        Into: "David Chen departure left TechVision manager Engineering"
+
+        Enhancements are cached per whitespace-normalized query, and concurrent
+        calls for the same query share one LLM request.
 
         Args:
-            query: Search query text
-            use_entity_filter: Whether entity filter was chosen
+            natural_query: Natural language question from user
 
         Returns:
-            Explanation string
+            Enhanced query with entity names and key concepts
         """
-        words = query.split()
-        capitalized_count = sum(
-            1 for i, word in enumerate(words)
-            if i > 0 and re.sub(r'[^\w\s]', '', word) and re.sub(r'[^\w\s]', '', word)[0].isupper()
-        )
+        key = " ".join(natural_query.split())
+        cached = self.enhancement_cache.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._enhancements_in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request_enhancement(natural_query))
+            self._enhancements_in_flight[key] = task
+            task.add_done_callback(lambda _: self._enhancements_in_flight.pop(key, None))
+
+        enhanced_query = await asyncio.shield(task)
+        if enhanced_query is None:
+            # Fallback to original if enhancement failed (not cached, so it is retried)
+            return natural_query
 
-        if use_entity_filter:
-            if capitalized_count >= 2:
-                return f"Found {capitalized_count} entity names (capitalized words) → use entity filter for precision"
-            elif capitalized_count == 1:
-                return "Found 1 entity name → use entity filter for precision"
-            else:
-                return "Manual override → entity filter"
-        else:
-            query_lower = query.lower()
-            question_patterns = ['what car', 'what vehicle', 'when is', 'where is', 'how much', 'do you have', 'can i']
-            for pattern in question_patterns:
-                if pattern in query_lower:
-                    return f"Generic question pattern '{pattern}' detected → use semantic search for recall"
-
-            if capitalized_count == 0:
-                return "No entity names found → use semantic search for recall"
-            else:
-                return "Manual override → semantic search"
+        self.enhancement_cache.set(key, enhanced_query)
+        return enhanced_query
+
+    async def _request_enhancement(self, natural_query: str) -> Optional[str]:
+        """Ask the LLM for an enhanced query; None if it failed or returned nothing usable"""
+        messages = [
+            Message(role="system", content=_ENHANCE_SYSTEM_PROMPT),
+            Message(role="user", content=_ENHANCE_USER_PROMPT.format(query=natural_query)),
+        ]
+
+        try:
+            async with self._llm_sem:
+                response = await self.llm_client.generate_response(messages, response_model=EnhancedQuery)
+            enhanced_query = (response.get("enhanced") or "").strip()
+
+            return enhanced_query if len(enhanced_query) >= 3 else None
 
-    def _extract_entity_names(self, query: str) -> List[str]:
+        except Exception as e:
+            logger.warning("Query enhancement failed: %s", e)
+            return None
+
+    @staticmethod
+    def _classify_query(query: str) -> QueryClassification:
         """
-        Extract potential entity names from query
+        Pick a search strategy and extract candidate entity names in one pass
 
-        Heuristic: Look for words that might be entity names (proper nouns)
-        - Capitalized words
-        - Words that are likely names (not common words)
+        Heuristics:
+        - 2+ capitalized words after the first → entity filter
+        - a generic question pattern → semantic search
+        - exactly 1 capitalized word → entity filter
+        Entity names are the non-stop-words that are capitalized or longer than 2 characters.
 
         Args:
             query: Search query text
 
         Returns:
-            List of potential entity names
+            QueryClassification with the strategy, its reason and the entity names
         """
-        # Common question words, prepositions, and verbs to exclude
-        stop_words = {
-            'what', 'where', 'when', 'who', 'how', 'why', 'which',
-            'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'at', 'to', 'for', 'of', 'on', 'with',
-            'his', 'her', 'their', 'my', 'your', 'its',
-            'working', 'work', 'works', 'role', 'job', 'position', 'title',
-            'left', 'departure', 'purchase', 'buy', 'service', 'maintenance'
-        }
+        # Strip punctuation from the whole query in one regex pass, then tokenize
+        words = _PUNCT_RE.sub('', query).split()
 
-        words = query.split()
-        entity_names = []
+        # Count proper nouns (capitalized words that aren't at start of sentence)
+        capitalized_count = sum(1 for word in words[1:] if len(word) > 1 and word[0].isupper())
 
-        for word in words:
-            # Clean punctuation
-            clean_word = re.sub(r'[^\w\s]', '', word)
-            if not clean_word:
-                continue
+        # Non-stop-words that start with a capital or could be a name, capitalized for consistency
+        entity_names = [
+            word.capitalize() for word in words
+            if (word[0].isupper() or len(word) > 2) and word.lower() not in _STOP_WORDS
+        ]
 
-            # Check if it's not a stop word (case-insensitive)
-            if clean_word.lower() in stop_words:
-                continue
+        # If query has 2+ capitalized words (likely entity names), use entity filter
+        if capitalized_count >= 2:
+            return QueryClassification(
+                True,
+                f"Found {capitalized_count} entity names (capitalized words) → use entity filter for precision",
+                entity_names
+            )
 
-            # Check if it starts with capital OR if it's a potential name
-            # (we'll be lenient and include any non-stop-word that could be a name)
-            if clean_word[0].isupper() or len(clean_word) > 2:
-                # Capitalize first letter for consistency
-                entity_names.append(clean_word.capitalize())
+        # Common question patterns need semantic search
+        query_lower = query.lower()
+        pattern = next((p for p in _QUESTION_PATTERNS if p in query_lower), None)
+        if pattern:
+            return QueryClassification(
+                False, f"Generic question pattern '{pattern}' detected → use semantic search for recall", entity_names
+            )
 
-        return entity_names
+        # Default: use entity filter if query has at least one capitalized word
+        if capitalized_count == 1:
+            return QueryClassification(True, "Found 1 entity name → use entity filter for precision", entity_names)
+        return QueryClassification(False, "No entity names found → use semantic search for recall", entity_names)
 
-    async def _find_entities_by_name(self, entity_names: List[str]) -> List[str]:
+    async def _search_by_entities(
+        self,
+        entity_names: List[str],
+        group_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Find entity UUIDs by name (case-insensitive partial match)
+        Search for edges connected to the entities matching the given names
+
+        Results are served from the one-hop cache where possible; otherwise the
+        name match and the edge expansion run as one Cypher query.
 
         Args:
-            entity_names: List of entity names to search for
+            entity_names: Entity names to match (case-insensitive partial match)
+            group_ids: Optional group IDs to restrict edges to
 
         Returns:
-            List of entity UUIDs
+            Up to OneHopCache.MAX_EDGES edges, newest first
         """
         if not entity_names:
             return []
 
-        # Build case-insensitive regex pattern for each name
-        name_patterns = [f"(?i).*{re.escape(name)}.*" for name in entity_names]
-
-        query = """
-        MATCH (e:Entity)
-        WHERE any(pattern IN $patterns WHERE e.name =~ pattern)
-        RETURN e.uuid AS uuid, e.name AS name
-        LIMIT 10
-        """
+        # Plain substring match against lowercased names; avoids compiling a
+        # regex per row per pattern on the server
+        lower_names = frozenset(name.lower() for name in entity_names)
+        scope = self.one_hop_cache.scope_for(group_ids)
+        template = self.RELATES_TO_TEMPLATE
 
-        async with self.graphiti.driver.session() as session:
-            result = await session.run(query, patterns=name_patterns)
-            records = await result.data()
-            return [record['uuid'] for record in records]
+        edges = self.one_hop_cache.get(scope, lower_names, template)
+        if edges is None:
+            edges = await self._fetch_entity_edges(sorted(lower_names), group_ids)
+            self.one_hop_cache.set(scope, lower_names, template, edges)
+        return edges
 
-    async def _search_by_entities(
+    async def _fetch_entity_edges(
         self,
-        entity_uuids: List[str],
-        num_results: int = 5
+        lower_names: List[str],
+        group_ids: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
-        Search for edges connected to specific entities
+        Match entities by name and return their most recent RELATES_TO edges (either direction)
 
         Args:
-            entity_uuids: List of entity UUIDs to search for
-            num_results: Number of results to return
+            lower_names: Lowercased entity names to match
+            group_ids: Optional group IDs to restrict edges to
 
         Returns:
-            List of edges connected to the entities
+            Edges around up to MAX_ENTITIES matching entities, newest first
         """
-        if not entity_uuids:
-            return []
-
-        # Query for edges where either source or target is one of the entities
         query = """
-        MATCH (source:Entity)-[r:RELATES_TO]->(target:Entity)
-        WHERE source.uuid IN $entity_uuids OR target.uuid IN $entity_uuids
+        MATCH (m:Entity)
+        WHERE any(n IN $lower_names WHERE toLower(m.name) CONTAINS n)
+        WITH m LIMIT $max_entities
+        MATCH (m)-[r:RELATES_TO]-(:Entity)
+        WHERE $group_ids IS NULL OR r.group_id IN $group_ids
+        WITH DISTINCT r
         RETURN r.uuid AS uuid, r.fact AS fact, r.name AS name,
                r.created_at AS created_at, r.valid_at AS valid_at, r.expired_at AS expired_at
         ORDER BY r.created_at DESC
         LIMIT $limit
         """
 
-        async with self.graphiti.driver.session() as session:
-            result = await session.run(query, entity_uuids=entity_uuids, limit=num_results)
+        async with shared_session(self.graphiti) as session, self._neo4j_sem:
+            result = await session.run(
+                query,
+                lower_names=lower_names,
+                group_ids=group_ids or None,
+                max_entities=OneHopCache.MAX_ENTITIES,
+                limit=OneHopCache.MAX_EDGES
+            )
             records = await result.data()
 
-            return [
-                {
-                    "fact": record['fact'],
-                    "uuid": str(record['uuid']),
-                    "name": record['name'],
-                    "created_at": record['created_at'].isoformat() if record['created_at'] else None,
-                    "valid_at": record['valid_at'].isoformat() if record['valid_at'] else None,
-                    "expired_at": record['expired_at'].isoformat() if record['expired_at'] else None,
-                }
-                for record in records
-            ]
+        return [
+            {
+                "fact": record['fact'],
+                "uuid": str(record['uuid']),
+                "name": record['name'],
+                "created_at": record['created_at'].isoformat() if record['created_at'] else None,
+                "valid_at": record['valid_at'].isoformat() if record['valid_at'] else None,
+                "expired_at": record['expired_at'].isoformat() if record['expired_at'] else None,
+            }
+            for record in records
+        ]
+
+    @staticmethod
+    def _merge_edges(*edge_lists: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge edge lists, dropping duplicates, newest first"""
+        edges_by_uuid = {}
+        for edges in edge_lists:
+            for edge in edges:
+                edges_by_uuid.setdefault(edge["uuid"], edge)
+        return sorted(edges_by_uuid.values(), key=lambda e: e["created_at"] or "", reverse=True)
 
     async def search(
         self,
@@ -293,73 +372,91 @@ Output:"""
         Returns:
             Dict with results and transformation metadata
         """
+        # One session for every Cypher lookup this search makes
+        async with shared_session(self.graphiti):
+            return await self._search(query, num_results, group_ids, min_score, use_entity_filter, enhance_query)
+
+    async def _search(
+        self,
+        query: str,
+        num_results: int,
+        group_ids: Optional[List[str]],
+        min_score: float,
+        use_entity_filter: Optional[bool],
+        enhance_query: bool
+    ) -> Dict[str, Any]:
         # Store original query for logging
         original_query = query
         enhanced_query = query
         strategy_auto_detected = use_entity_filter is None
 
         # Step 1: Auto-detect strategy if not specified
+        classification = self._classify_query(query)
         if use_entity_filter is None:
-            use_entity_filter = self._should_use_entity_filter(query)
-            strategy_reason = self._get_strategy_reason(query, use_entity_filter)
-            print(f"🤖 Auto-detected strategy: {'Entity Filter' if use_entity_filter else 'Semantic Search'}")
-            print(f"   Reason: {strategy_reason}")
+            use_entity_filter = classification.use_entity_filter
+            strategy_reason = classification.reason
+            logger.debug(
+                "🤖 Auto-detected strategy: %s (%s)",
+                "Entity Filter" if use_entity_filter else "Semantic Search", strategy_reason
+            )
         else:
-            # Manual override
-            strategy_reason = self._get_strategy_reason(query, use_entity_filter)
+            strategy_reason = "Manual override"
 
-        # Step 2: Enhance query with LLM if enabled and using entity filter
+        # Step 2: Search around the names already in the query while the LLM enhances it
         query_was_enhanced = False
-        if enhance_query and use_entity_filter:
-            enhanced_query = await self._enhance_query_with_llm(query)
-            query_was_enhanced = enhanced_query != original_query
-            if query_was_enhanced:
-                print(f"🔍 Query Enhancement:")
-                print(f"   Original: {original_query}")
-                print(f"   Enhanced: {enhanced_query}")
-
-        # Step 3: Try entity-based filtering if enabled
         search_method = "semantic_search"
         entity_names_found = []
 
         if use_entity_filter:
-            entity_names = self._extract_entity_names(enhanced_query)
+            entity_names = classification.entity_names
+            if enhance_query:
+                enhanced_query, entity_results = await asyncio.gather(
+                    self._enhance_query_with_llm(query),
+                    self._search_by_entities(entity_names, group_ids)
+                )
+            else:
+                entity_results = await self._search_by_entities(entity_names, group_ids)
+
+            query_was_enhanced = enhanced_query != original_query
+            if query_was_enhanced:
+                logger.debug("🔍 Query Enhancement: %r -> %r", original_query, enhanced_query)
+
+                # Second, smaller lookup for names only the enhanced query contains
+                extra_names = [
+                    name for name in dict.fromkeys(self._classify_query(enhanced_query).entity_names)
+                    if name not in entity_names
+                ]
+                if extra_names:
+                    entity_names = entity_names + extra_names
+                    extra_results = await self._search_by_entities(extra_names, group_ids)
+                    entity_results = self._merge_edges(entity_results, extra_results)
+
             entity_names_found = entity_names
 
-            if entity_names:
-                # Find entities in the graph
-                entity_uuids = await self._find_entities_by_name(entity_names)
-
-                if entity_uuids:
-                    # Search for edges connected to these entities
-                    entity_results = await self._search_by_entities(entity_uuids, num_results)
-
-                    if entity_results:
-                        # If we found results via entity filtering, return them
-                        search_method = "entity_filter"
-                        return {
-                            "transformation": {
-                                "original_query": original_query,
-                                "enhanced_query": enhanced_query if query_was_enhanced else None,
-                                "query_was_enhanced": query_was_enhanced,
-                                "strategy_auto_detected": strategy_auto_detected,
-                                "strategy_used": "entity_filter",
-                                "strategy_reason": strategy_reason if strategy_auto_detected else "Manual override",
-                                "entity_names_extracted": entity_names_found,
-                                "search_method": search_method
-                            },
-                            "results": entity_results
-                        }
+            # Step 3: Return the edges around the matched entities, if any
+            if entity_results:
+                search_method = "entity_filter"
+                return {
+                    "transformation": {
+                        "original_query": original_query,
+                        "enhanced_query": enhanced_query if query_was_enhanced else None,
+                        "query_was_enhanced": query_was_enhanced,
+                        "strategy_auto_detected": strategy_auto_detected,
+                        "strategy_used": "entity_filter",
+                        "strategy_reason": strategy_reason,
+                        "entity_names_extracted": entity_names_found,
+                        "search_method": search_method
+                    },
+                    "results": entity_results[:num_results]
+                }
 
         # Step 4: Fallback to semantic search if entity filtering didn't work or was disabled
-        results = await self.graphiti.search(
-            query=enhanced_query if enhance_query else query,
-            num_results=num_results * 3,  # Get 3x results for better filtering
-            group_ids=group_ids
-        )
-
-        # Filter and limit results
-        filtered_results = results[:num_results]
+        async with self._neo4j_sem:
+            results = await self.graphiti.search(
+                query=enhanced_query if enhance_query else query,
+                num_results=num_results,
+                group_ids=group_ids
+            )
 
         result_list = [
             {
@@ -370,7 +467,7 @@ Output:"""
                 "valid_at": result.valid_at.isoformat() if result.valid_at else None,
                 "expired_at": result.expired_at.isoformat() if result.expired_at else None,
             }
-            for result in filtered_results
+            for result in results
         ]
 
         return {
@@ -380,7 +477,7 @@ Output:"""
                 "query_was_enhanced": query_was_enhanced,
                 "strategy_auto_detected": strategy_auto_detected,
                 "strategy_used": "entity_filter" if use_entity_filter else "semantic_search",
-                "strategy_reason": strategy_reason if strategy_auto_detected else "Manual override",
+                "strategy_reason": strategy_reason,
                 "entity_names_extracted": entity_names_found,
                 "search_method": search_method
             },
@@ -407,7 +504,7 @@ Output:"""
         }) as relationships
         """
         
-        async with self.graphiti.driver.session() as session:
+        async with shared_session(self.graphiti) as session, self._neo4j_sem:
             result = await session.run(query, uuid=entity_uuid)
             record = await result.single()
             
@@ -432,34 +529,30 @@ Output:"""
         Returns:
             Statistics about the knowledge graph
         """
+        # Independent count subqueries: each is a count-store lookup and, unlike
+        # chained MATCHes, still returns a row when a label has no nodes
         query = """
-        MATCH (e:Entity)
-        WITH count(e) as entity_count
-        MATCH ()-[r:RELATES_TO]->()
-        WITH entity_count, count(r) as rel_count
-        MATCH (ep:Episodic)
-        RETURN entity_count, rel_count, count(ep) as episode_count
+        CALL { MATCH (e:Entity) RETURN count(e) AS entities }
+        CALL { MATCH ()-[r:RELATES_TO]->() RETURN count(r) AS relationships }
+        CALL { MATCH (ep:Episodic) RETURN count(ep) AS episodes }
+        RETURN entities, relationships, episodes,
+               CASE WHEN entities > 1
+                    THEN toFloat(relationships) / (entities * (entities - 1))
+                    ELSE 0.0 END AS density,
+               CASE WHEN entities > 0
+                    THEN toFloat(relationships) / entities
+                    ELSE 0 END AS avg_relationships
         """
         
-        async with self.graphiti.driver.session() as session:
+        async with shared_session(self.graphiti) as session, self._neo4j_sem:
             result = await session.run(query)
             record = await result.single()
             
-            entities = record['entity_count']
-            relationships = record['rel_count']
-            episodes = record['episode_count']
-            
-            # Calculate graph density
-            density = 0.0
-            if entities > 1:
-                max_edges = entities * (entities - 1)
-                density = relationships / max_edges if max_edges > 0 else 0.0
-            
             return {
-                "entities": entities,
-                "relationships": relationships,
-                "episodes": episodes,
-                "graph_density": round(density, 4),
-                "avg_relationships_per_entity": round(relationships / entities, 2) if entities > 0 else 0
+                "entities": record['entities'],
+                "relationships": record['relationships'],
+                "episodes": record['episodes'],
+                "graph_density": round(record['density'], 4),
+                "avg_relationships_per_entity": round(record['avg_relationships'], 2)
             }
 
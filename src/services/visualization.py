@@ -1,6 +1,11 @@
 """Visualization service for knowledge graph"""
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 from graphiti_core import Graphiti
+from src.core.database import shared_session
+
+# Mermaid labels can't contain double quotes; node IDs can't contain spaces or dashes
+_QUOTE_TABLE = str.maketrans({'"': "'"})
+_ID_TABLE = str.maketrans({' ': '_', '-': '_'})
 
 
 class VisualizationService:
@@ -19,31 +24,42 @@ class VisualizationService:
         Returns:
             Mermaid diagram as string
         """
-        query = f"""
+        return "\n".join([line async for line in self.mermaid_lines(max_nodes)]) + "\n"
+    
+    async def mermaid_lines(self, max_nodes: int = 20) -> AsyncIterator[str]:
+        """
+        Yield the Mermaid diagram one line at a time (without newlines)
+
+        Records are rendered as they arrive from Neo4j, so large diagrams can be
+        streamed to a response or file without holding the rows or the output in
+        memory. The session stays open until the generator is exhausted or closed.
+        It is a private session rather than shared_session(): a context variable set
+        inside a generator would leak into the consumer between yields.
+        
+        Args:
+            max_nodes: Maximum number of nodes to include
+        """
+        query = """
         MATCH (e1:Entity)-[r:RELATES_TO]->(e2:Entity)
         RETURN e1.name AS source, r.name AS relationship, e2.name AS target
-        LIMIT {max_nodes}
+        LIMIT $max_nodes
         """
         
-        async with self.graphiti.driver.session() as session:
-            result = await session.run(query)
-            relationships = await result.data()
-        
-        # Generate Mermaid diagram
-        mermaid = "graph LR\n"
+        yield "graph LR"
         
-        for rel in relationships:
-            source = rel['source'].replace('"', "'")
-            target = rel['target'].replace('"', "'")
-            rel_type = rel['relationship'].replace('"', "'")
-            
-            # Create node IDs (sanitize names)
-            source_id = source.replace(" ", "_").replace("-", "_")
-            target_id = target.replace(" ", "_").replace("-", "_")
+        async with self.graphiti.driver.session() as session:
+            result = await session.run(query, max_nodes=max_nodes)
             
-            mermaid += f'    {source_id}["{source}"] -->|{rel_type}| {target_id}["{target}"]\n'
-        
-        return mermaid
+            async for rel in result:
+                source = rel['source'].translate(_QUOTE_TABLE)
+                target = rel['target'].translate(_QUOTE_TABLE)
+                rel_type = rel['relationship'].translate(_QUOTE_TABLE)
+                
+                # Create node IDs (sanitize names)
+                source_id = source.translate(_ID_TABLE)
+                target_id = target.translate(_ID_TABLE)
+                
+                yield f'    {source_id}["{source}"] -->|{rel_type}| {target_id}["{target}"]'
     
     async def get_graph_summary(self) -> Dict[str, Any]:
         """
@@ -52,19 +68,17 @@ class VisualizationService:
         Returns:
             Dict with graph summary data
         """
+        # One subquery per aggregate; the degree average reads each entity's
+        # degree once instead of re-expanding it for every edge
         query = """
-        MATCH (e:Entity)
-        WITH count(e) as entity_count
-        MATCH ()-[r:RELATES_TO]->()
-        WITH entity_count, count(r) as rel_count
-        MATCH (ep:Episodic)
-        WITH entity_count, rel_count, count(ep) as episode_count
-        MATCH (e:Entity)-[r]-()
-        RETURN entity_count, rel_count, episode_count,
-               avg(size((e)-[]-()) ) as avg_degree
+        CALL { MATCH (e:Entity) RETURN count(e) AS entity_count }
+        CALL { MATCH ()-[r:RELATES_TO]->() RETURN count(r) AS rel_count }
+        CALL { MATCH (ep:Episodic) RETURN count(ep) AS episode_count }
+        CALL { MATCH (e:Entity) RETURN avg(COUNT { (e)--() }) AS avg_degree }
+        RETURN entity_count, rel_count, episode_count, avg_degree
         """
         
-        async with self.graphiti.driver.session() as session:
+        async with shared_session(self.graphiti) as session:
             result = await session.run(query)
             record = await result.single()
             
@@ -1,2 +1,8 @@
 """Utility modules for Graph RAG / Temporal Knowledge Graph RAG"""
+from .cache import TTLCache
+from .serialization import json_default
 
+__all__ = [
+    "TTLCache",
+    "json_default",
+]
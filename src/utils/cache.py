@@ -0,0 +1,63 @@
+"""In-process caching helpers"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a fixed time-to-live
+
+    Not thread-safe; intended for use from a single asyncio event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries if full"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value (expired entries count as missing)"""
+        item = self._data.pop(key, None)
+        if item is None or item[0] < time.monotonic():
+            return default
+        return item[1]
+
+    def evict(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches predicate; returns the number removed"""
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and item[0] >= time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,9 @@
+"""Serialization helpers"""
+from typing import Any
+
+
+def json_default(obj: Any) -> Any:
+    """orjson `default` hook for types it does not know natively (e.g. Neo4j temporal values)"""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return str(obj)
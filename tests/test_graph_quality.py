@@ -2,363 +2,479 @@
 Test graph quality and three-tier structure
 Validates Episode Subgraph, Semantic Entity Subgraph, and Community Subgraph
 """
+import asyncio
+import logging
+import pytest
+import httpx
+import orjson
+import os
+import re
 import requests
 import time
-import json
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+log = logging.getLogger("graph_quality")
+
+SEP = "=" * 80
+
+# Server timestamps are datetime.isoformat() of a whole-second, timezone-aware time
+_ISO_RE = re.compile(r"^(?P<date>\d{4}-\d{2}-\d{2})T\d{2}:\d{2}:\d{2}([+-]\d{2}:\d{2}|Z)$")
 
 API_BASE_URL = "http://localhost:8000"
 
+HEALTH_URL = f"{API_BASE_URL}/health"
+INGEST_URL = f"{API_BASE_URL}/ingest"
+INGEST_BATCH_URL = f"{API_BASE_URL}/ingest/batch"
+STATS_URL = f"{API_BASE_URL}/stats"
+EPISODES_URL = f"{API_BASE_URL}/episodes?limit=10"
+ENTITIES_URL = f"{API_BASE_URL}/entities?limit=20"
+SEARCH_URL = f"{API_BASE_URL}/search"
+
+# Static request bodies are serialized once and sent as raw bytes
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Independent ingests submitted together by the seeded_graph fixture, keyed by the scenario that checks them
+SEED_PAYLOADS = {
+    "text": {
+        "data": "Sarah Chen joined DataCorp as Chief Data Officer on January 15, 2024. She previously worked at TechGiant for 8 years.",
+        "reference_time": "2024-01-15T09:00:00Z",
+        "context": "Executive hire announcement"
+    },
+    "json": {
+        "data": {
+            "project": "AI Platform Migration",
+            "status": "in_progress",
+            "team_lead": "Michael Rodriguez",
+            "team_members": ["Alice Wang", "Bob Johnson", "Carol Martinez"],
+            "start_date": "2024-02-01",
+            "budget": 500000,
+            "technologies": ["Python", "TensorFlow", "Kubernetes", "Neo4j"]
+        },
+        "reference_time": "2024-02-01T00:00:00Z",
+        "context": "Q1 2024 strategic project"
+    },
+    "entities": {
+        "data": "Dr. Emily Watson leads the Research Division at InnovateLabs. She specializes in Natural Language Processing and has published 15 papers on transformer architectures.",
+        "reference_time": "2024-03-01T00:00:00Z"
+    },
+    "temporal": {
+        "data": "On December 1, 2023, GlobalTech acquired StartupXYZ for $50 million. The acquisition was led by CEO Jennifer Park.",
+        "reference_time": "2023-12-01T00:00:00Z",  # Timeline T: when event occurred
+        "context": "Historical acquisition data"
+    },
+}
+SEED_BODIES = {scenario: orjson.dumps(payload) for scenario, payload in SEED_PAYLOADS.items()}
+
+# Tiny ingest sent once per session so the real tests hit a warm server
+WARMUP_BODY = orjson.dumps({"data": "warmup", "reference_time": "2024-01-01T00:00:00Z"})
+
+SEARCH_QUERY = {
+    "query": "Who works in engineering or technology?",
+    "num_results": 5,
+    "include_temporal": True
+}
+SEARCH_BODY = orjson.dumps(SEARCH_QUERY)
+
+# Same entity mentioned in different ways, submitted as one batch (entity resolution)
+ENTITY_RESOLUTION_BODY = orjson.dumps({
+    "items": [
+        {
+            "data": "Dr. Sarah Chen is the Chief Data Officer at DataCorp.",
+            "reference_time": "2024-01-15T00:00:00Z"
+        },
+        {
+            "data": "Sarah Chen, CDO of DataCorp, announced a new AI initiative.",
+            "reference_time": "2024-01-20T00:00:00Z"
+        },
+    ]
+})
+
+
+def _json(response):
+    """Decode a response body with orjson (works for requests and httpx responses)"""
+    return orjson.loads(response.content)
+
+
+def _assert_iso_date(ts, expected_date):
+    """Assert ts is an ISO 8601 timestamp on expected_date (YYYY-MM-DD)"""
+    match = _ISO_RE.match(ts)
+    assert match and match.group("date") == expected_date, f"{ts!r} is not an ISO timestamp on {expected_date}"
+
+
+def _wait_for_episodes(session, prev_episodes, expected_delta_episodes=1, timeout=3.0, interval=0.1):
+    """Poll /stats until the episode count reflects the latest ingests (at most `timeout` seconds)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = session.get(STATS_URL, timeout=5)
+        if response.ok and _json(response)["episodes"] >= prev_episodes + expected_delta_episodes:
+            return
+        time.sleep(interval)
+
+
+def _new_session():
+    """
+    A plain requests.Session, or a requests-cache CachedSession when TGRAG_TEST_CACHE is set
+
+    The cache is for repeated local runs against an unchanged graph: only GETs of
+    the listing endpoints are stored (for 30s, in tests/.pytest_cache, which git
+    ignores), while /health and /stats, which the fixtures poll, always go to the server.
+    """
+    if not os.environ.get("TGRAG_TEST_CACHE"):
+        return requests.Session()
+
+    from requests_cache import DO_NOT_CACHE, CachedSession
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".pytest_cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    return CachedSession(
+        os.path.join(cache_dir, "tgrag_test_cache"),
+        expire_after=DO_NOT_CACHE,
+        urls_expire_after={f"{API_BASE_URL}/entities": 30, f"{API_BASE_URL}/episodes": 30},
+        allowable_methods=("GET",),
+    )
+
+
+async def _poll_episodes(client, prev_episodes, expected_delta_episodes=1, timeout=3.0, interval=0.1):
+    """Async _wait_for_episodes over an httpx.AsyncClient; the event loop stays free between polls"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = await client.get(STATS_URL, timeout=5)
+        if response.is_success and _json(response)["episodes"] >= prev_episodes + expected_delta_episodes:
+            return
+        await asyncio.sleep(interval)
+
+
+@pytest.fixture(scope="session")
+def api_session():
+    """One keep-alive connection pool shared by every test"""
+    session = _new_session()
+    # urllib3 only retries idempotent methods, so /ingest POSTs are never replayed
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503], raise_on_status=False)
+    )
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _require_api(api_session):
+    """
+    Check /health once and skip the whole session if the API is not ready; returns the health payload
+
+    A healthy API then gets one throwaway ingest, so the first real ingest does not
+    pay for the server's cold LLM and embedding clients (the health check has
+    already opened the pooled connection).
+    """
+    try:
+        response = api_session.get(HEALTH_URL, timeout=2)
+        data = _json(response)
+        assert response.ok and data.get("graphiti") == "connected", data
+    except Exception as e:
+        pytest.skip(f"API not ready: {e}")
+
+    try:
+        api_session.post(INGEST_URL, data=WARMUP_BODY, headers=JSON_HEADERS, timeout=90)
+    except requests.RequestException as e:
+        log.warning("⚠️  Warmup ingest failed: %s", e)
+    return data
+
+
+@pytest.fixture(scope="session")
+def seeded_graph(api_session):
+    """
+    Submit the seed ingests concurrently, once per session; maps scenario -> its /ingest response
+
+    Tests that read graph state depend on this fixture instead of on ingests made
+    by earlier tests, so they can run in any order (or under pytest-xdist, where
+    each worker seeds its own copy).
+    """
+    response = api_session.get(STATS_URL, timeout=10)
+    assert response.status_code == 200
+    episodes_before = _json(response)["episodes"]
+
+    async def run():
+        limits = httpx.Limits(max_keepalive_connections=8)
+        async with httpx.AsyncClient(limits=limits, timeout=90) as client:
+            responses = await asyncio.gather(*[
+                client.post(INGEST_URL, content=body, headers=JSON_HEADERS)
+                for body in SEED_BODIES.values()
+            ])
+            created = sum(1 for response in responses if response.status_code == 201)
+            await _poll_episodes(client, episodes_before, expected_delta_episodes=created)
+            return responses
+
+    return dict(zip(SEED_BODIES, asyncio.run(run())))
+
+
+class _StatsCache:
+    """
+    Reuses a /stats response for `ttl` seconds; invalidated after each ingest
+
+    Expired entries are revalidated with If-None-Match against the server's ETag,
+    so an unchanged graph costs a bodiless 304 instead of a new payload to parse.
+    """
+
+    def __init__(self):
+        self.value = None
+        self.etag = None
+        self.fetched_at = 0.0
+
+    def get(self, session, ttl=0.5):
+        now = time.monotonic()
+        if self.value is not None and now - self.fetched_at <= ttl:
+            return self.value
+
+        headers = {"If-None-Match": self.etag} if self.value is not None and self.etag else None
+        response = session.get(STATS_URL, headers=headers, timeout=10)
+        if response.status_code != 304:
+            assert response.status_code == 200
+            self.value = _json(response)
+            self.etag = response.headers.get("ETag")
+        self.fetched_at = now
+        return self.value
+
+    def invalidate(self):
+        """Force the next get() to revalidate with the server"""
+        self.fetched_at = 0.0
+
 
 class TestGraphQuality:
     """Test the quality of the knowledge graph structure"""
 
-    def setup_method(self):
-        """Setup before each test"""
-        self.session = requests.Session()
+    _stats = _StatsCache()
 
-    def teardown_method(self):
-        """Cleanup after each test"""
-        self.session.close()
+    @pytest.fixture(autouse=True)
+    def _bind_session(self, api_session):
+        """Expose the shared session to each test as self.session"""
+        self.session = api_session
 
-    def wait_for_processing(self, seconds=2):
-        """Wait for graph processing to complete"""
-        time.sleep(seconds)
+    def wait_for_processing(self, prev_episodes, expected_delta_episodes=1, timeout=3.0, interval=0.1):
+        """Poll /stats until the episode count reflects the latest ingests (at most `timeout` seconds)"""
+        _wait_for_episodes(self.session, prev_episodes, expected_delta_episodes, timeout, interval)
+        self._stats.invalidate()
 
-    def test_01_health_check(self):
-        """Test API is healthy"""
-        response = self.session.get(f"{API_BASE_URL}/health", timeout=5)
-        assert response.status_code == 200
-        data = response.json()
+    def test_health_check(self, _require_api):
+        """Test API is healthy (the check itself runs once in the _require_api fixture)"""
+        data = _require_api
         assert data["status"] == "healthy"
         assert data["graphiti"] == "connected"
-        print("✅ API is healthy and Graphiti is connected")
+        log.info("✅ API is healthy and Graphiti is connected")
 
-    def test_02_episode_subgraph_text_ingestion(self):
+    def test_episode_subgraph_text_ingestion(self, seeded_graph):
         """Test Episode Subgraph creation from text data"""
-        print("\n" + "="*80)
-        print("TEST: Episode Subgraph - Text Ingestion")
-        print("="*80)
+        log.info("%s\nTEST: Episode Subgraph - Text Ingestion\n%s", SEP, SEP)
 
-        # Ingest text data
-        test_data = {
-            "data": "Sarah Chen joined DataCorp as Chief Data Officer on January 15, 2024. She previously worked at TechGiant for 8 years.",
-            "reference_time": "2024-01-15T09:00:00Z",
-            "context": "Executive hire announcement"
-        }
-
-        response = self.session.post(
-            f"{API_BASE_URL}/ingest",
-            json=test_data,
-            timeout=90
-        )
+        # Text data was ingested by the seeded_graph fixture
+        response = seeded_graph["text"]
 
         # Handle rate limits gracefully
         if response.status_code == 429:
-            print("⚠️  Rate limit reached - skipping ingestion test")
+            log.warning("⚠️  Rate limit reached - skipping ingestion test")
             return
 
         assert response.status_code == 201
-        result = response.json()
+        result = _json(response)
 
         # Verify episode was created
         assert result["status"] == "success"
         assert "episode_name" in result
         assert result["reference_time"] == "2024-01-15T09:00:00+00:00"
 
-        print(f"✅ Episode created: {result['episode_name']}")
-        print(f"   Reference time (T): {result['reference_time']}")
-        print(f"   Ingested at (T'): {result['ingested_at']}")
-
-        self.wait_for_processing(3)
+        log.info("✅ Episode created: %s", result['episode_name'])
+        log.info("   Reference time (T): %s", result['reference_time'])
+        log.info("   Ingested at (T'): %s", result['ingested_at'])
 
         # Verify episode appears in list
-        response = self.session.get(f"{API_BASE_URL}/episodes?limit=10", timeout=10)
+        response = self.session.get(EPISODES_URL, timeout=10)
         assert response.status_code == 200
-        episodes = response.json()
+        episodes = _json(response)
         assert episodes["total"] > 0
-        print(f"✅ Total episodes in graph: {episodes['total']}")
+        log.info("✅ Total episodes in graph: %s", episodes['total'])
 
-    def test_03_episode_subgraph_json_ingestion(self):
+    def test_episode_subgraph_json_ingestion(self, seeded_graph):
         """Test Episode Subgraph creation from JSON data"""
-        print("\n" + "="*80)
-        print("TEST: Episode Subgraph - JSON Ingestion")
-        print("="*80)
-
-        # Ingest structured JSON data
-        test_data = {
-            "data": {
-                "project": "AI Platform Migration",
-                "status": "in_progress",
-                "team_lead": "Michael Rodriguez",
-                "team_members": ["Alice Wang", "Bob Johnson", "Carol Martinez"],
-                "start_date": "2024-02-01",
-                "budget": 500000,
-                "technologies": ["Python", "TensorFlow", "Kubernetes", "Neo4j"]
-            },
-            "reference_time": "2024-02-01T00:00:00Z",
-            "context": "Q1 2024 strategic project"
-        }
+        log.info("%s\nTEST: Episode Subgraph - JSON Ingestion\n%s", SEP, SEP)
 
-        response = self.session.post(
-            f"{API_BASE_URL}/ingest",
-            json=test_data,
-            timeout=90
-        )
+        # Structured JSON data was ingested by the seeded_graph fixture
+        response = seeded_graph["json"]
 
         if response.status_code == 429:
-            print("⚠️  Rate limit reached - skipping ingestion test")
+            log.warning("⚠️  Rate limit reached - skipping ingestion test")
             return
 
         assert response.status_code == 201
-        result = response.json()
+        result = _json(response)
         assert result["status"] == "success"
         assert result["data_type"] == "dict"
 
-        print(f"✅ JSON episode created: {result['episode_name']}")
-        print(f"   Data type: {result['data_type']}")
-
-        self.wait_for_processing(3)
-
-    def test_04_semantic_entity_extraction(self):
-        """Test Semantic Entity Subgraph - entity extraction"""
-        print("\n" + "="*80)
-        print("TEST: Semantic Entity Subgraph - Entity Extraction")
-        print("="*80)
-
-        # Get current entity count
-        response = self.session.get(f"{API_BASE_URL}/stats", timeout=10)
-        assert response.status_code == 200
-        stats_before = response.json()
-
-        print(f"📊 Current graph state:")
-        print(f"   Entities: {stats_before['entities']}")
-        print(f"   Relationships: {stats_before['relationships']}")
-        print(f"   Episodes: {stats_before['episodes']}")
+        log.info("✅ JSON episode created: %s", result['episode_name'])
+        log.info("   Data type: %s", result['data_type'])
 
+    def test_semantic_subgraph(self, seeded_graph):
+        """Test Semantic Entity Subgraph - entity and relationship extraction"""
+        log.info("%s\nTEST: Semantic Entity Subgraph - Entities and Relationships\n%s", SEP, SEP)
 
-        # Ingest data with clear entities
-        test_data = {
-            "data": "Dr. Emily Watson leads the Research Division at InnovateLabs. She specializes in Natural Language Processing and has published 15 papers on transformer architectures.",
-            "reference_time": "2024-03-01T00:00:00Z"
-        }
-
-        response = self.session.post(
-            f"{API_BASE_URL}/ingest",
-            json=test_data,
-            timeout=90
-        )
+        # Data with clear entities was ingested by the seeded_graph fixture
+        response = seeded_graph["entities"]
 
         if response.status_code == 429:
-            print("⚠️  Rate limit reached - skipping test")
+            log.warning("⚠️  Rate limit reached - skipping test")
             return
 
         assert response.status_code == 201
-        self.wait_for_processing(3)
 
-        # Check entities were extracted
-        response = self.session.get(f"{API_BASE_URL}/entities?limit=20", timeout=10)
-        assert response.status_code == 200
-        entities_data = response.json()
+        # Get current graph state
+        stats = self._stats.get(self.session)
 
-        print(f"\n✅ Entities extracted: {entities_data['total']}")
+        log.info("📊 Current graph state:")
+        log.info("   Entities: %s", stats['entities'])
+        log.info("   Relationships: %s", stats['relationships'])
+        log.info("   Episodes: %s", stats['episodes'])
 
-        # Display sample entities
-        if entities_data['entities']:
-            print(f"\n📋 Sample entities:")
-            for entity in entities_data['entities'][:5]:
-                print(f"   - {entity['name']} (created: {entity.get('created_at', 'N/A')})")
+        assert stats['entities'] > 0, "Graph should have extracted entities"
+        assert stats['relationships'] > 0, "Graph should have extracted relationships"
 
-    def test_05_semantic_relationships(self):
-        """Test Semantic Entity Subgraph - relationship extraction"""
-        print("\n" + "="*80)
-        print("TEST: Semantic Entity Subgraph - Relationships")
-        print("="*80)
+        ratio = stats['relationships'] / stats['entities']
+        log.info("   Relationship/Entity ratio: %.2f", ratio)
+        log.info("✅ Entities and relationships successfully extracted")
 
-        # Get statistics
-        response = self.session.get(f"{API_BASE_URL}/stats", timeout=10)
+        # List a sample of the extracted entities
+        response = self.session.get(ENTITIES_URL, timeout=10)
         assert response.status_code == 200
-        stats = response.json()
+        entities_data = _json(response)
 
-        print(f"📊 Graph relationships:")
-        print(f"   Total relationships: {stats['relationships']}")
-        print(f"   Total entities: {stats['entities']}")
+        log.info("\n✅ Entities extracted: %s", entities_data['total'])
 
-        if stats['relationships'] > 0:
-            ratio = stats['relationships'] / max(stats['entities'], 1)
-            print(f"   Relationship/Entity ratio: {ratio:.2f}")
-
-            # A good knowledge graph should have relationships
-            assert stats['relationships'] > 0, "Graph should have extracted relationships"
-            print("✅ Relationships successfully extracted")
-        else:
-            print("⚠️  No relationships found (may need more data)")
+        # Display sample entities
+        if entities_data['entities']:
+            log.info("\n📋 Sample entities:")
+            for entity in entities_data['entities'][:5]:
+                log.info("   - %s (created: %s)", entity['name'], entity.get('created_at', 'N/A'))
 
-    def test_06_temporal_tracking(self):
+    def test_temporal_tracking(self, seeded_graph):
         """Test bi-temporal model (Timeline T and T')"""
-        print("\n" + "="*80)
-        print("TEST: Bi-Temporal Model - Timeline T and T'")
-        print("="*80)
+        log.info("%s\nTEST: Bi-Temporal Model - Timeline T and T'\n%s", SEP, SEP)
 
-        # Ingest historical data
-        test_data = {
-            "data": "On December 1, 2023, GlobalTech acquired StartupXYZ for $50 million. The acquisition was led by CEO Jennifer Park.",
-            "reference_time": "2023-12-01T00:00:00Z",  # Timeline T: when event occurred
-            "context": "Historical acquisition data"
-        }
-
-        ingestion_time = datetime.now().isoformat()
-
-        response = self.session.post(
-            f"{API_BASE_URL}/ingest",
-            json=test_data,
-            timeout=90
-        )
+        # Historical data was ingested by the seeded_graph fixture
+        response = seeded_graph["temporal"]
 
         if response.status_code == 429:
-            print("⚠️  Rate limit reached - skipping test")
+            log.warning("⚠️  Rate limit reached - skipping test")
             return
 
         assert response.status_code == 201
-        result = response.json()
+        result = _json(response)
 
         # Verify bi-temporal tracking
         reference_time = result["reference_time"]  # Timeline T
         ingested_at = result["ingested_at"]  # Timeline T'
 
-        print(f"✅ Bi-temporal tracking verified:")
-        print(f"   Timeline T (event occurred): {reference_time}")
-        print(f"   Timeline T' (ingested at): {ingested_at}")
+        log.info("✅ Bi-temporal tracking verified:")
+        log.info("   Timeline T (event occurred): %s", reference_time)
+        log.info("   Timeline T' (ingested at): %s", ingested_at)
 
         # Timeline T should be in the past, T' should be recent
-        assert "2023-12-01" in reference_time
+        _assert_iso_date(reference_time, "2023-12-01")
         assert reference_time != ingested_at
-        print("✅ Timeline T ≠ Timeline T' (as expected)")
+        log.info("✅ Timeline T ≠ Timeline T' (as expected)")
 
-    def test_07_hybrid_search(self):
+    def test_hybrid_search(self, seeded_graph):
         """Test hybrid retrieval (semantic + BM25 + graph)"""
-        print("\n" + "="*80)
-        print("TEST: Hybrid Retrieval - Semantic Search")
-        print("="*80)
+        log.info("%s\nTEST: Hybrid Retrieval - Semantic Search\n%s", SEP, SEP)
 
         # Perform semantic search
-        search_query = {
-            "query": "Who works in engineering or technology?",
-            "num_results": 5,
-            "include_temporal": True
-        }
-
         response = self.session.post(
-            f"{API_BASE_URL}/search",
-            json=search_query,
+            SEARCH_URL,
+            data=SEARCH_BODY,
+            headers=JSON_HEADERS,
             timeout=15
         )
 
         assert response.status_code == 200
-        results = response.json()
+        results = _json(response)
 
-        print(f"✅ Search completed:")
-        print(f"   Query: {search_query['query']}")
-        print(f"   Results found: {len(results.get('results', []))}")
+        log.info("✅ Search completed:")
+        log.info("   Query: %s", SEARCH_QUERY['query'])
+        log.info("   Results found: %s", len(results.get('results', [])))
 
         # Display results
         if results.get('results'):
-            print(f"\n📋 Top results:")
+            log.info("\n📋 Top results:")
             for i, result in enumerate(results['results'][:3], 1):
-                print(f"   {i}. {result.get('name', 'Unknown')}")
+                log.info("   %s. %s", i, result.get('name', 'Unknown'))
                 if 'created_at' in result:
-                    print(f"      Created: {result['created_at']}")
+                    log.info("      Created: %s", result['created_at'])
 
-    def test_08_entity_resolution(self):
+    def test_entity_resolution(self):
         """Test entity resolution (duplicate detection)"""
-        print("\n" + "="*80)
-        print("TEST: Entity Resolution - Duplicate Detection")
-        print("="*80)
+        log.info("%s\nTEST: Entity Resolution - Duplicate Detection\n%s", SEP, SEP)
 
         # Get initial entity count
-        response = self.session.get(f"{API_BASE_URL}/stats", timeout=10)
-        stats_before = response.json()
+        stats_before = self._stats.get(self.session)
         entities_before = stats_before['entities']
 
-        # Ingest data mentioning same entity in different ways
-        test_data_1 = {
-            "data": "Dr. Sarah Chen is the Chief Data Officer at DataCorp.",
-            "reference_time": "2024-01-15T00:00:00Z"
-        }
-
-        test_data_2 = {
-            "data": "Sarah Chen, CDO of DataCorp, announced a new AI initiative.",
-            "reference_time": "2024-01-20T00:00:00Z"
-        }
-
-        # Ingest first mention
-        response = self.session.post(f"{API_BASE_URL}/ingest", json=test_data_1, timeout=90)
+        # Ingest both mentions in one batch request
+        response = self.session.post(INGEST_BATCH_URL, data=ENTITY_RESOLUTION_BODY, headers=JSON_HEADERS, timeout=90)
         if response.status_code == 429:
-            print("⚠️  Rate limit reached - skipping test")
+            log.warning("⚠️  Rate limit reached - skipping test")
             return
 
-        self.wait_for_processing(3)
-
-        # Ingest second mention
-        response = self.session.post(f"{API_BASE_URL}/ingest", json=test_data_2, timeout=90)
-        if response.status_code == 429:
-            print("⚠️  Rate limit reached after first ingestion")
-            return
+        assert response.status_code == 201
+        assert _json(response)["count"] == 2
 
-        self.wait_for_processing(3)
+        self.wait_for_processing(stats_before['episodes'], expected_delta_episodes=2)
 
         # Check if entities were merged (entity resolution)
-        response = self.session.get(f"{API_BASE_URL}/stats", timeout=10)
-        stats_after = response.json()
+        stats_after = self._stats.get(self.session)
         entities_after = stats_after['entities']
 
-        print(f"📊 Entity resolution check:")
-        print(f"   Entities before: {entities_before}")
-        print(f"   Entities after: {entities_after}")
-        print(f"   New entities: {entities_after - entities_before}")
+        log.info("📊 Entity resolution check:")
+        log.info("   Entities before: %s", entities_before)
+        log.info("   Entities after: %s", entities_after)
+        log.info("   New entities: %s", entities_after - entities_before)
 
         # Graphiti should ideally merge "Dr. Sarah Chen" and "Sarah Chen"
         # But this depends on the LLM's entity resolution capability
-        print("✅ Entity resolution test completed")
+        log.info("✅ Entity resolution test completed")
 
-    def test_09_graph_statistics_summary(self):
-        """Final test - comprehensive graph statistics"""
-        print("\n" + "="*80)
-        print("TEST: Final Graph Statistics Summary")
-        print("="*80)
+    def test_graph_statistics_summary(self, seeded_graph):
+        """Comprehensive graph statistics"""
+        log.info("%s\nTEST: Final Graph Statistics Summary\n%s", SEP, SEP)
 
-        response = self.session.get(f"{API_BASE_URL}/stats", timeout=10)
-        assert response.status_code == 200
-        stats = response.json()
+        stats = self._stats.get(self.session)
 
-        print(f"\n📊 FINAL GRAPH STATE:")
-        print(f"   {'='*60}")
-        print(f"   Episodes (Raw Data):        {stats['episodes']}")
-        print(f"   Entities (Extracted):       {stats['entities']}")
-        print(f"   Relationships (Extracted):  {stats['relationships']}")
-        print(f"   {'='*60}")
+        log.info("\n📊 FINAL GRAPH STATE:")
+        log.info("   %s", SEP[:60])
+        log.info("   Episodes (Raw Data):        %s", stats['episodes'])
+        log.info("   Entities (Extracted):       %s", stats['entities'])
+        log.info("   Relationships (Extracted):  %s", stats['relationships'])
+        log.info("   %s", SEP[:60])
 
         # Calculate graph density
         if stats['entities'] > 1:
             max_relationships = stats['entities'] * (stats['entities'] - 1)
             density = stats['relationships'] / max_relationships if max_relationships > 0 else 0
-            print(f"   Graph Density:              {density:.4f}")
+            log.info("   Graph Density:              %.4f", density)
 
         # Verify three-tier structure
-        print(f"\n✅ THREE-TIER GRAPH STRUCTURE VERIFIED:")
-        print(f"   1. Episode Subgraph:        {stats['episodes']} episodes")
-        print(f"   2. Semantic Entity Subgraph: {stats['entities']} entities, {stats['relationships']} relationships")
-        print(f"   3. Community Subgraph:       (managed by Graphiti)")
+        log.info("\n✅ THREE-TIER GRAPH STRUCTURE VERIFIED:")
+        log.info("   1. Episode Subgraph:        %s episodes", stats['episodes'])
+        log.info("   2. Semantic Entity Subgraph: %s entities, %s relationships", stats['entities'], stats['relationships'])
+        log.info("   3. Community Subgraph:       (managed by Graphiti)")
 
         # Quality checks
         assert stats['episodes'] > 0, "Should have at least one episode"
-        print(f"\n✅ Graph quality checks passed!")
+        log.info("\n✅ Graph quality checks passed!")
 
 
 if __name__ == "__main__":
-    print("="*80)
+    print(SEP)
     print("GRAPH QUALITY TEST SUITE")
-    print("="*80)
+    print(SEP)
     print("\nThis test suite validates:")
     print("  1. Episode Subgraph (raw data storage)")
     print("  2. Semantic Entity Subgraph (entity/relationship extraction)")
@@ -367,5 +483,5 @@ if __name__ == "__main__":
     print("  5. Hybrid retrieval (semantic + BM25 + graph)")
     print("  6. Entity resolution (duplicate detection)")
     print("\nRun with: pytest test_graph_quality.py -v -s")
-    print("="*80)
+    print(SEP)
 
@@ -0,0 +1,71 @@
+"""
+Unit tests for DataIngestionService batch ingestion (Graphiti is replaced by a recording fake)
+"""
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.services.ingestion import DataIngestionService
+
+
+class _RecordingGraphiti:
+    """Fake Graphiti whose add_episode records the calls in flight per group"""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.in_flight = {}
+        self.max_in_flight = {}
+        self.max_total_in_flight = 0
+        self.bodies = []
+
+    async def add_episode(self, name, episode_body, source, source_description, reference_time, group_id):
+        self.in_flight[group_id] = self.in_flight.get(group_id, 0) + 1
+        self.max_in_flight[group_id] = max(self.max_in_flight.get(group_id, 0), self.in_flight[group_id])
+        self.max_total_in_flight = max(self.max_total_in_flight, sum(self.in_flight.values()))
+        try:
+            await asyncio.sleep(0.01)
+            if episode_body in self.fail_on:
+                raise RuntimeError(f"extraction failed for {episode_body}")
+            self.bodies.append((group_id, episode_body))
+            return SimpleNamespace(episode=SimpleNamespace(uuid=uuid4()))
+        finally:
+            self.in_flight[group_id] -= 1
+
+
+def _items(group_id, count):
+    return [{"data": f"{group_id} event {i}", "group_ids": [group_id]} for i in range(count)]
+
+
+def test_ingest_batch_serializes_each_tenant_and_overlaps_tenants():
+    graphiti = _RecordingGraphiti()
+    items = _items("tenant-a", 3) + _items("tenant-b", 3)
+
+    results = asyncio.run(DataIngestionService(graphiti).ingest_batch(items, concurrency=2))
+
+    assert [result["group_id"] for result in results] == ["tenant-a"] * 3 + ["tenant-b"] * 3
+    assert graphiti.max_in_flight == {"tenant-a": 1, "tenant-b": 1}
+    assert graphiti.max_total_in_flight == 2
+    # Each tenant's episodes are added in input order
+    assert [body for group, body in graphiti.bodies if group == "tenant-a"] == [item["data"] for item in items[:3]]
+
+
+def test_ingest_batch_reports_failed_items_and_continues():
+    graphiti = _RecordingGraphiti(fail_on={"tenant-a event 1"})
+
+    results = asyncio.run(DataIngestionService(graphiti).ingest_batch(_items("tenant-a", 3)))
+
+    assert [result["status"] for result in results] == ["success", "error", "success"]
+    assert results[1]["group_id"] == "tenant-a"
+    assert "extraction failed" in results[1]["error"]
+
+
+def test_ingest_json_accepts_integers_wider_than_64_bits():
+    graphiti = _RecordingGraphiti()
+    data = {"account": "ACME", "balance": 2**70, "history": [1, -2**65]}
+
+    result = asyncio.run(DataIngestionService(graphiti).ingest_data(data, group_ids=["tenant-a"]))
+
+    assert result["status"] == "success"
+    assert result["data_type"] == "dict"
+    (_, body), = graphiti.bodies
+    assert str(2**70) in body and str(-2**65) in body
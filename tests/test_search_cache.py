@@ -0,0 +1,31 @@
+"""
+Unit tests for the /search response cache keys and their per-tenant invalidation
+"""
+from src.api import routes
+from src.api.models import SearchQuery
+
+
+def test_ingest_into_one_tenant_keeps_other_tenants_searches_cached():
+    query = SearchQuery(query="Who leads the engineering team?")
+    key_a = routes._search_cache_key(query, ["tenant-a"])
+    key_b = routes._search_cache_key(query, ["tenant-b"])
+    key_unscoped = routes._search_cache_key(query, None)
+    routes._search_cache.set(key_b, {"results": ["cached for tenant-b"]})
+
+    routes._invalidate_search_cache(["tenant-a"])
+
+    assert routes._search_cache_key(query, ["tenant-b"]) == key_b
+    assert routes._search_cache.get(key_b) == {"results": ["cached for tenant-b"]}
+    assert routes._search_cache_key(query, ["tenant-a"]) != key_a
+    assert routes._search_cache_key(query, None) != key_unscoped
+
+
+def test_unscoped_ingest_keeps_scoped_searches_cached():
+    query = SearchQuery(query="What changed at DataCorp?")
+    key_c = routes._search_cache_key(query, ["tenant-c"])
+    key_unscoped = routes._search_cache_key(query, None)
+
+    routes._invalidate_search_cache(None)
+
+    assert routes._search_cache_key(query, ["tenant-c"]) == key_c
+    assert routes._search_cache_key(query, None) != key_unscoped